@@ -53,6 +53,8 @@ OPTIONAL_PACKAGES = {
     'asyncio_mqtt': 'asyncio-mqtt==0.16.1',
     'pjsua2': 'pjsua2==2.13.1',
     'threading_timer': 'threading-timer==0.1.0',
+    'ahocorasick': 'pyahocorasick==2.1.0',
+    'redis': 'redis==5.0.8',
 }
 
 
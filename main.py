@@ -46,7 +46,10 @@ if not PRODUCTION_MODE_CHECK:
         print("   Continuing anyway...\n")
 
 # Now import remaining modules
+import re
 import time
+import random
+import queue
 import threading
 import subprocess
 from pathlib import Path
@@ -177,6 +180,10 @@ try:
         send_whatsapp_optin_sms,
         send_payment_link_sms,
         has_optin_sms_been_sent,
+        handle_sms_status_callback,
+        set_sms_status_callback_base,
+        validate_sms_status_request,
+        sms_status_callback_configured,
         ENABLE_WHATSAPP_OPTIN_SMS
     )
     SMS_SERVICE_AVAILABLE = True
@@ -249,10 +256,13 @@ def cleanup_old_sessions():
 # Dashboard integration
 DASHBOARD_API_URL = os.environ.get("DASHBOARD_API_URL", "http://localhost:5016/api")
 
+# Keep-alive session for dashboard requests (reuses TCP/TLS connections)
+dashboard_session = requests.Session()
+
 def log_call_to_dashboard(call_data):
     """Log call to dashboard backend"""
     try:
-        response = requests.post(
+        response = dashboard_session.post(
             f"{DASHBOARD_API_URL}/calls",
             json=call_data,
             timeout=5
@@ -270,7 +280,7 @@ def log_call_to_dashboard(call_data):
 def update_call_in_dashboard(call_id, update_data):
     """Update call in dashboard backend"""
     try:
-        response = requests.patch(
+        response = dashboard_session.patch(
             f"{DASHBOARD_API_URL}/calls/{call_id}",
             json=update_data,
             timeout=5
@@ -285,10 +295,14 @@ def update_call_in_dashboard(call_id, update_data):
         print(f"⚠️ Dashboard update error: {e}")
         return None
 
-def update_call_transcript(call_id, transcript_text):
-    """Update call transcript in dashboard backend"""
+# Transcript lines are sent by a background worker so the speech webhook never
+# waits on the dashboard; lines queued for the same call are merged into one PATCH
+_transcript_queue = queue.Queue(maxsize=1000)
+
+def _send_call_transcript(call_id, transcript_text):
+    """Send a transcript update to the dashboard backend"""
     try:
-        response = requests.patch(
+        response = dashboard_session.patch(
             f"{DASHBOARD_API_URL}/calls/{call_id}/transcript",
             json={'transcript': transcript_text},
             timeout=5
@@ -302,10 +316,42 @@ def update_call_transcript(call_id, transcript_text):
         print(f"⚠️ Transcript update error: {e}")
         return None
 
+def _coalesce_transcripts(batch):
+    """Merge queued (call_id, line) pairs into one text per call, one line each"""
+    pending = {}
+    for call_id, transcript_text in batch:
+        # Callers start each line with '\n'; add it if one didn't so lines never run together
+        if not transcript_text.startswith('\n'):
+            transcript_text = '\n' + transcript_text
+        pending[call_id] = pending.get(call_id, '') + transcript_text
+    return pending
+
+def _transcript_worker():
+    """Drain queued transcript lines, coalescing them per call"""
+    while True:
+        batch = [_transcript_queue.get()]
+        while True:
+            try:
+                batch.append(_transcript_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        for call_id, transcript_text in _coalesce_transcripts(batch).items():
+            _send_call_transcript(call_id, transcript_text)
+
+threading.Thread(target=_transcript_worker, daemon=True, name='dashboard-transcript').start()
+
+def update_call_transcript(call_id, transcript_text):
+    """Queue a call transcript line ("\n[HH:MM:SS] Speaker: text") for the dashboard backend"""
+    try:
+        _transcript_queue.put_nowait((call_id, transcript_text))
+    except queue.Full:
+        print(f"⚠️ Transcript queue full, dropping update for {call_id}")
+
 def log_payment_to_dashboard(payment_data):
     """Log payment link to dashboard backend"""
     try:
-        response = requests.post(
+        response = dashboard_session.post(
             f"{DASHBOARD_API_URL}/payments",
             json=payment_data,
             timeout=5
@@ -323,7 +369,7 @@ def log_payment_to_dashboard(payment_data):
 def log_whatsapp_message_to_dashboard(message_data):
     """Log WhatsApp message to dashboard backend"""
     try:
-        response = requests.post(
+        response = dashboard_session.post(
             f"{DASHBOARD_API_URL}/whatsapp/messages",
             json=message_data,
             timeout=5
@@ -378,7 +424,6 @@ def create_audio_server():
             
             if range_header:
                 # Parse range header
-                import re
                 match = re.search(r'bytes=(\d+)-(\d*)', range_header)
                 if match:
                     start = int(match.group(1))
@@ -770,6 +815,7 @@ def create_voice_bot_server():
         print(f"🔍 DEBUG: Request args: {dict(request.args)}")
         response = VoiceResponse()
         speech_result = request.form.get('SpeechResult', '')
+        speech_lower = speech_result.lower()  # shared by every keyword check below
         from_number = request.form.get('From', 'Unknown')
         call_sid = request.form.get('CallSid')
         
@@ -873,7 +919,6 @@ def create_voice_bot_server():
                             # Try to extract customer name from user's speech
                             # Common patterns: "mera naam X hai", "my name is X", "I am X"
                             if not call_sessions[call_sid].get('customer_name'):
-                                import re
                                 name_patterns = [
                                     r'(?:my name is|i am|this is|naam hai|mera naam|naam)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
                                     r'^([A-Z][a-z]+)(?:\s+(?:here|speaking|hai|hun|hoon))?$',
@@ -1081,7 +1126,7 @@ def create_voice_bot_server():
                                 
                                 # Check if user confirms they sent the message (retry logic)
                                 optin_confirmations = ['bhej diya', 'send kar diya', 'done', 'ho gaya', 'kar diya', 'sent', 'message bheja', 'hi bhej diya']
-                                if session.get('whatsapp_needs_optin') and any(kw in speech_result.lower() for kw in optin_confirmations):
+                                if session.get('whatsapp_needs_optin') and any(kw in speech_lower for kw in optin_confirmations):
                                     print(f"📱 WhatsApp: User confirmed opt-in, retrying payment link...")
                                     pending = session.get('pending_payment_link', {})
                                     if pending:
@@ -1110,9 +1155,6 @@ def create_voice_bot_server():
                                             print(f"❌ WhatsApp retry error: {retry_err}")
                                 
                                 # Check if user says link didn't come - offer to resend
-                                # Define speech_lower here for use in this scope
-                                speech_lower_check = speech_result.lower() if speech_result else ''
-                                
                                 link_not_received_phrases = ['link nahi aayi', 'लिंक नहीं आई', 'link nahi aaya', 'लिंक नहीं आया',
                                                              'link nahi mila', 'लिंक नहीं मिला', 'link nahi mili', 'लिंक नहीं मिली',
                                                              'payment link nahi', 'पेमेंट लिंक नहीं', 'link nahi aayi hai', 'लिंक नहीं आई है',
@@ -1129,8 +1171,8 @@ def create_voice_bot_server():
                                 payment_just_sent_this_turn = session.get('payment_link_just_sent', False)
                                 resend_attempts = session.get('resend_attempts', 0)
                                 
-                                link_not_received = session.get('payment_link_success') and not payment_just_sent_this_turn and any(phrase in speech_lower_check or phrase in speech_result for phrase in link_not_received_phrases)
-                                explicit_resend = not payment_just_sent_this_turn and any(phrase in speech_lower_check or phrase in speech_result for phrase in resend_request_phrases)
+                                link_not_received = session.get('payment_link_success') and not payment_just_sent_this_turn and any(phrase in speech_lower or phrase in speech_result for phrase in link_not_received_phrases)
+                                explicit_resend = not payment_just_sent_this_turn and any(phrase in speech_lower or phrase in speech_result for phrase in resend_request_phrases)
                                 
                                 # Limit resend attempts to prevent spam (max 2 resends)
                                 if (link_not_received or explicit_resend) and resend_attempts < 2:
@@ -1274,7 +1316,6 @@ def create_voice_bot_server():
                                   'bhej do', 'भेज दो', 'resend', 'vaapas', 'वापस', 'phir se', 'फिर से']
                 
                 # Check if user wants to end call
-                speech_lower = speech_result.lower() if speech_result else ''
                 should_hangup = False
                 
                 # Check explicit hangup keywords
@@ -1660,12 +1701,31 @@ def create_voice_bot_server():
                 print(f"🧹 Cleaned up session for completed call: {call_sid}")
         
         # Periodic cleanup of old sessions (every 10th status update)
-        import random
         if random.random() < 0.1:  # 10% chance to run cleanup
             cleanup_old_sessions()
         
         return "OK"
     
+    @bot_app.route('/sms_status', methods=['POST'])
+    def sms_status():
+        """Twilio SMS delivery status callback"""
+        if SMS_SERVICE_AVAILABLE:
+            if not sms_status_callback_configured():
+                # The signed URL is unknown, so no callback can be verified
+                print("⚠️ Rejected SMS status callback: set BASE_URL or SMS_STATUS_CALLBACK_URL "
+                      "(and TWILIO_AUTH_TOKEN) to verify Twilio signatures")
+                return Response("Forbidden", status=403)
+            if not validate_sms_status_request(request.headers.get('X-Twilio-Signature'),
+                                               request.form.to_dict()):
+                print("⚠️ Rejected SMS status callback with invalid Twilio signature")
+                return Response("Forbidden", status=403)
+            handle_sms_status_callback(
+                request.form.get('MessageSid'),
+                request.form.get('MessageStatus'),
+                request.form.get('ErrorCode')
+            )
+        return "OK"
+    
     @bot_app.route('/media/<call_sid>', methods=['POST'])
     def handle_media_stream(call_sid):
         """Handle Twilio Media Streams for real-time audio processing"""
@@ -2219,6 +2279,10 @@ def main():
         print("❌ Ngrok failed")
         return
     
+    # Route opt-in SMS delivery updates through the same public URL
+    if SMS_SERVICE_AVAILABLE:
+        set_sms_status_callback_base(ngrok_url)
+    
     # 4. Start WhatsApp service (if enabled)
     if WHATSAPP_AVAILABLE and is_whatsapp_enabled():
         try:
@@ -5,7 +5,9 @@ Stores per-call context and conversation history for better responses
 
 import time
 import json
-from typing import Dict, List, Optional, Any
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import threading
@@ -29,13 +31,13 @@ class CallContext:
     user_location: Optional[str] = None
     service_type: Optional[str] = None  # hotel, train, restaurant, flight
     preferences: Dict[str, Any] = None
-    conversation_history: List[ConversationExchange] = None
+    conversation_history: Deque[ConversationExchange] = None
     
     def __post_init__(self):
         if self.preferences is None:
             self.preferences = {}
         if self.conversation_history is None:
-            self.conversation_history = []
+            self.conversation_history = deque()
 
 class ConversationMemory:
     """Manages conversation memory and context for calls"""
@@ -57,7 +59,8 @@ class ConversationMemory:
             context = CallContext(
                 call_sid=call_sid,
                 start_time=time.time(),
-                language=language
+                language=language,
+                conversation_history=deque(maxlen=self.max_history_per_call)
             )
             self.active_calls[call_sid] = context
             print(f"🧠 Started conversation memory for call: {call_sid}")
@@ -86,12 +89,9 @@ class ConversationMemory:
                 confidence=confidence
             )
             
+            # Bounded deque keeps only recent history
             context.conversation_history.append(exchange)
             
-            # Keep only recent history
-            if len(context.conversation_history) > self.max_history_per_call:
-                context.conversation_history = context.conversation_history[-self.max_history_per_call:]
-            
             print(f"🧠 Added exchange to memory for {call_sid}: {user_text[:30]}...")
     
     def update_context(self, call_sid: str, **kwargs):
@@ -178,7 +178,7 @@ class ConversationMemory:
             
             # Short-term conversation recall (last 3-5 turns only)
             if context.conversation_history:
-                recent_exchanges = context.conversation_history[-self.short_term_recall:]
+                recent_exchanges = self._recent_exchanges(context)
                 
                 # Apply context fade - older exchanges get less weight
                 weighted_topics = []
@@ -207,7 +207,7 @@ class ConversationMemory:
             if call_sid not in self.active_calls:
                 return []
             
-            return self.active_calls[call_sid].conversation_history.copy()
+            return list(self.active_calls[call_sid].conversation_history)
     
     def get_recent_conversation_history(self, call_sid: str) -> List[ConversationExchange]:
         """Get only recent conversation history (last 3-5 turns) for AI processing"""
@@ -216,7 +216,7 @@ class ConversationMemory:
                 return []
             
             context = self.active_calls[call_sid]
-            recent_history = context.conversation_history[-self.short_term_recall:]
+            recent_history = self._recent_exchanges(context)
             
             # Apply context fade to older exchanges
             faded_history = []
@@ -239,6 +239,11 @@ class ConversationMemory:
             
             return faded_history
     
+    def _recent_exchanges(self, context: CallContext) -> List[ConversationExchange]:
+        """Last short_term_recall exchanges, without copying the rest of the history"""
+        history = context.conversation_history
+        return list(islice(history, max(0, len(history) - self.short_term_recall), None))
+    
     def store_neutral_facts(self, call_sid: str, user_text: str):
         """Store only neutral, factual information to avoid overfitting"""
         with self.lock:
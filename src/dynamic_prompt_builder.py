@@ -6,7 +6,7 @@ Builds AI prompts dynamically based on active product data.
 Integrates with existing PromptManager and adds product-specific context.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from src.prompt_manager import PromptManager
 
 
@@ -15,6 +15,8 @@ class DynamicPromptBuilder:
     
     def __init__(self):
         self.prompt_manager = PromptManager()
+        # Product-only prompt sections, reused while the active product's version is unchanged
+        self._product_sections = (None, None)
         print("🔨 Dynamic Prompt Builder initialized")
     
     def build_prompt(
@@ -62,21 +64,7 @@ class DynamicPromptBuilder:
     ) -> str:
         """Build product-aware prompt with scope control."""
         
-        # Load base prompts
-        try:
-            core_persona = self.prompt_manager.load_prompt("core_persona")
-            context_type = product.get('context_type', 'sales')
-            context_prompt = self.prompt_manager.get_context_prompt(context_type)
-        except Exception as e:
-            print(f"⚠️ Prompt loading error: {e}")
-            core_persona = "You are Sara, a helpful AI assistant."
-            context_prompt = ""
-        
-        # Build product context section
-        product_context = self._build_product_context(product)
-        
-        # Build scope control rules
-        scope_rules = self._build_scope_rules(product)
+        core_persona, product_context, context_prompt, scope_rules = self._get_product_sections(product)
         
         # Build conversation context
         conv_context = self._build_conversation_context(conversation_history)
@@ -143,6 +131,41 @@ REMEMBER: You are Sara - warm, helpful, but NOT pushy. Speak ONE thing at a time
         
         return full_prompt.strip()
     
+    def _get_product_sections(self, product: Dict) -> Tuple[str, str, str, str]:
+        """Get the sections of the prompt that depend only on the product."""
+        
+        # The dashboard bumps updatedAt on every save, so (id, updated_at) identifies the content;
+        # products without a version are rebuilt each time
+        product_key = (product.get('product_id'), product.get('updated_at'))
+        cacheable = product_key[1] is not None
+        cached_key, sections = self._product_sections
+        if cacheable and product_key == cached_key:
+            return sections
+        
+        # Load base prompts
+        try:
+            core_persona = self.prompt_manager.load_prompt("core_persona")
+            context_type = product.get('context_type', 'sales')
+            context_prompt = self.prompt_manager.get_context_prompt(context_type)
+            loaded = True
+        except Exception as e:
+            print(f"⚠️ Prompt loading error: {e}")
+            core_persona = "You are Sara, a helpful AI assistant."
+            context_prompt = ""
+            loaded = False
+        
+        # Build product context section
+        product_context = self._build_product_context(product)
+        
+        # Build scope control rules
+        scope_rules = self._build_scope_rules(product)
+        
+        sections = (core_persona, product_context, context_prompt, scope_rules)
+        if loaded and cacheable:
+            # Don't pin the fallback persona; retry loading on the next turn
+            self._product_sections = (product_key, sections)
+        return sections
+    
     def _build_product_context(self, product: Dict) -> str:
         """Build product-specific context section."""
         
@@ -8,11 +8,18 @@ for complex cases. Provides emotion-aware response generation.
 
 import os
 import time
+from collections import deque
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 from src.config import EMOTION_DETECTION_MODE
 from src.mixed_ai_brain import MixedAIBrain
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 class EmotionalTone(Enum):
     """Emotional tone enumeration"""
     EMPATHETIC = "empathetic"
@@ -25,64 +32,129 @@ class EmotionalTone(Enum):
     HAPPY = "happy"
 
 
+# Keyword-based emotion indicators
+EMOTION_KEYWORDS = {
+    'angry': {
+        'en': ['angry', 'frustrated', 'upset', 'annoyed', 'mad', 'irritated', 'pissed', 'furious'],
+        'hi': ['gussa', 'pareshan', 'problem', 'problem hai', 'boring', 'tension', 'dikkat', 'pareshan hun', 'gussa hai'],
+        'mixed': ['angry', 'frustrated', 'gussa', 'problem', 'upset', 'annoyed', 'pareshan']
+    },
+    'confused': {
+        'en': ['confused', 'don\'t understand', 'unclear', 'not sure', 'what is', 'how does', 'why is', 'where is'],
+        'hi': ['samajh nahi', 'confused', 'kaise', 'kya', 'kahan', 'kyun', 'kab', 'kya matlab', 'samajh nahi aaya', 'samajh nahi aata'],
+        'mixed': ['confused', 'samajh nahi', 'don\'t understand', 'kaise', 'kya', 'how', 'samajh nahi aaya']
+    },
+    'happy': {
+        'en': ['great', 'good', 'perfect', 'wonderful', 'excellent', 'amazing', 'fantastic', 'love'],
+        'hi': ['accha', 'shabash', 'bahut accha', 'perfect', 'wonderful', 'excellent', 'mast', 'bahut accha hai'],
+        'mixed': ['great', 'accha', 'perfect', 'shabash', 'wonderful', 'excellent', 'mast', 'bahut accha']
+    },
+    'sad': {
+        'en': ['sad', 'disappointed', 'unhappy', 'depressed', 'down', 'upset', 'hurt'],
+        'hi': ['dukhi', 'upset', 'sad', 'problem', 'tension', 'pareshan'],
+        'mixed': ['sad', 'dukhi', 'upset', 'disappointed', 'problem', 'tension']
+    },
+    'excited': {
+        'en': ['excited', 'thrilled', 'enthusiastic', 'pumped', 'eager', 'can\'t wait'],
+        'hi': ['excited', 'enthusiastic', 'eager', 'ready', 'thrilled'],
+        'mixed': ['excited', 'thrilled', 'enthusiastic', 'ready', 'eager']
+    },
+    'neutral': {
+        'en': ['okay', 'fine', 'alright', 'sure', 'yes', 'no', 'maybe'],
+        'hi': ['theek', 'okay', 'haan', 'nahi', 'shayad', 'bilkul'],
+        'mixed': ['okay', 'theek', 'fine', 'sure', 'haan', 'nahi']
+    },
+    'empathetic': {
+        'en': ['help', 'support', 'assist', 'sorry', 'apologize', 'understand', 'feel', 'need help', 'struggling', 'difficult'],
+        'hi': ['madad', 'sahayata', 'maaf', 'sorry', 'samajh', 'feel', 'help', 'pareshan', 'dikkat'],
+        'mixed': ['help', 'madad', 'support', 'sorry', 'maaf', 'understand', 'samajh', 'pareshan', 'dikkat']
+    }
+}
+
+# Emotion intensity modifiers
+INTENSITY_MODIFIERS = {
+    'very': 1.5,
+    'really': 1.3,
+    'so': 1.2,
+    'quite': 1.1,
+    'extremely': 1.8,
+    'super': 1.4,
+    'bahut': 1.3,
+    'zyada': 1.2
+}
+
+# Response guidance per detected emotion
+EMOTION_GUIDANCE_HI = {
+    'angry': 'User is frustrated. Respond with extra patience and empathy. Use calming language like "Chinta mat kariye" and "Main samajh sakti hun".',
+    'confused': 'User is confused. Slow down your response, use simple language, and ask clarifying questions. Use "Step by step kar lete hain".',
+    'happy': 'User is happy. Match their energy slightly while staying professional. Use positive language like "Bahut accha" and "Shabash".',
+    'sad': 'User seems sad or disappointed. Be extra empathetic and supportive. Use comforting language like "Koi baat nahi" and "Main help kar sakti hun".',
+    'excited': 'User is excited. Match their enthusiasm appropriately while staying professional. Use encouraging language.',
+    'neutral': 'Respond normally with warm, helpful tone.'
+}
+
+EMOTION_GUIDANCE_EN = {
+    'angry': 'User is frustrated. Respond with extra patience and empathy. Use calming language.',
+    'confused': 'User is confused. Slow down your response and use simple language.',
+    'happy': 'User is happy. Match their energy slightly while staying professional.',
+    'sad': 'User seems sad or disappointed. Be extra empathetic and supportive.',
+    'excited': 'User is excited. Match their enthusiasm appropriately while staying professional.',
+    'neutral': 'Respond normally with warm, helpful tone.'
+}
+
+# Emotions the GPT sentiment check is allowed to return
+VALID_GPT_EMOTIONS = frozenset({'angry', 'confused', 'happy', 'sad', 'excited', 'neutral'})
+
+
 class EmotionDetector:
     """Hybrid emotion detection with keyword and GPT-based analysis."""
     
     def __init__(self):
         self.ai_brain = MixedAIBrain()
         self.turn_count = 0
-        self.emotion_history = []
+        self.emotion_history = deque(maxlen=10)  # recent (emotion, confidence, timestamp)
         
-        # Keyword-based emotion indicators
-        self.emotion_keywords = {
-            'angry': {
-                'en': ['angry', 'frustrated', 'upset', 'annoyed', 'mad', 'irritated', 'pissed', 'furious'],
-                'hi': ['gussa', 'pareshan', 'problem', 'problem hai', 'boring', 'tension', 'dikkat', 'pareshan hun', 'gussa hai'],
-                'mixed': ['angry', 'frustrated', 'gussa', 'problem', 'upset', 'annoyed', 'pareshan']
-            },
-            'confused': {
-                'en': ['confused', 'don\'t understand', 'unclear', 'not sure', 'what is', 'how does', 'why is', 'where is'],
-                'hi': ['samajh nahi', 'confused', 'kaise', 'kya', 'kahan', 'kyun', 'kab', 'kya matlab', 'samajh nahi aaya', 'samajh nahi aata'],
-                'mixed': ['confused', 'samajh nahi', 'don\'t understand', 'kaise', 'kya', 'how', 'samajh nahi aaya']
-            },
-            'happy': {
-                'en': ['great', 'good', 'perfect', 'wonderful', 'excellent', 'amazing', 'fantastic', 'love'],
-                'hi': ['accha', 'shabash', 'bahut accha', 'perfect', 'wonderful', 'excellent', 'mast', 'bahut accha hai'],
-                'mixed': ['great', 'accha', 'perfect', 'shabash', 'wonderful', 'excellent', 'mast', 'bahut accha']
-            },
-            'sad': {
-                'en': ['sad', 'disappointed', 'unhappy', 'depressed', 'down', 'upset', 'hurt'],
-                'hi': ['dukhi', 'upset', 'sad', 'problem', 'tension', 'pareshan'],
-                'mixed': ['sad', 'dukhi', 'upset', 'disappointed', 'problem', 'tension']
-            },
-            'excited': {
-                'en': ['excited', 'thrilled', 'enthusiastic', 'pumped', 'eager', 'can\'t wait'],
-                'hi': ['excited', 'enthusiastic', 'eager', 'ready', 'thrilled'],
-                'mixed': ['excited', 'thrilled', 'enthusiastic', 'ready', 'eager']
-            },
-            'neutral': {
-                'en': ['okay', 'fine', 'alright', 'sure', 'yes', 'no', 'maybe'],
-                'hi': ['theek', 'okay', 'haan', 'nahi', 'shayad', 'bilkul'],
-                'mixed': ['okay', 'theek', 'fine', 'sure', 'haan', 'nahi']
-            },
-            'empathetic': {
-                'en': ['help', 'support', 'assist', 'sorry', 'apologize', 'understand', 'feel', 'need help', 'struggling', 'difficult'],
-                'hi': ['madad', 'sahayata', 'maaf', 'sorry', 'samajh', 'feel', 'help', 'pareshan', 'dikkat'],
-                'mixed': ['help', 'madad', 'support', 'sorry', 'maaf', 'understand', 'samajh', 'pareshan', 'dikkat']
-            }
-        }
+        # Keyword tables are shared, read-only module constants
+        self.emotion_keywords = EMOTION_KEYWORDS
+        self.intensity_modifiers = INTENSITY_MODIFIERS
         
-        # Emotion intensity modifiers
-        self.intensity_modifiers = {
-            'very': 1.5,
-            'really': 1.3,
-            'so': 1.2,
-            'quite': 1.1,
-            'extremely': 1.8,
-            'super': 1.4,
-            'bahut': 1.3,
-            'zyada': 1.2
-        }
+        # One automaton per language so each turn is a single pass over the text
+        self._keyword_automata = self._build_keyword_automata()
+    
+    def _build_keyword_automata(self) -> Dict[str, 'ahocorasick.Automaton']:
+        """Map every keyword to the emotions that list it, per language."""
+        if not AHOCORASICK_AVAILABLE:
+            return {}
+        
+        automata = {}
+        for language in ('en', 'hi', 'mixed'):
+            automaton = ahocorasick.Automaton()
+            for emotion, lang_keywords in self.emotion_keywords.items():
+                for keyword in lang_keywords.get(language, lang_keywords.get('en', [])):
+                    # A keyword can belong to several emotions (e.g. 'problem')
+                    _, emotions = automaton.get(keyword, (keyword, ()))
+                    automaton.add_word(keyword, (keyword, emotions + (emotion,)))
+            automaton.make_automaton()
+            automata[language] = automaton
+        return automata
+    
+    def _keyword_hits(self, text_lower: str, language: str) -> Dict[str, int]:
+        """Count matched keywords per emotion (each keyword counted once)."""
+        automaton = self._keyword_automata.get(language) or self._keyword_automata.get('en')
+        hits = {}
+        if automaton is not None:
+            matched = dict(value for _, value in automaton.iter(text_lower))  # keyword -> emotions
+            for emotions in matched.values():
+                for emotion in emotions:
+                    hits[emotion] = hits.get(emotion, 0) + 1
+            return hits
+        
+        for emotion, lang_keywords in self.emotion_keywords.items():
+            keywords = lang_keywords.get(language, lang_keywords.get('en', []))
+            count = sum(1 for keyword in keywords if keyword in text_lower)
+            if count:
+                hits[emotion] = count
+        return hits
     
     def detect_emotion(self, text: str, language: str = 'en', use_gpt: bool = False) -> EmotionalTone:
         """
@@ -116,13 +188,9 @@ class EmotionDetector:
             emotion = quick_emotion
             confidence = quick_confidence
         
-        # Store emotion history for context
+        # Store emotion history for context (deque keeps only the last 10)
         self.emotion_history.append((emotion, confidence, time.time()))
         
-        # Keep only recent history (last 10 emotions)
-        if len(self.emotion_history) > 10:
-            self.emotion_history = self.emotion_history[-10:]
-        
         # Convert string emotion to EmotionalTone enum
         try:
             return EmotionalTone(emotion)
@@ -135,25 +203,23 @@ class EmotionDetector:
             return 'neutral', 0.5
         
         text_lower = text.lower().strip()
-        words = text_lower.split()
+        hits = self._keyword_hits(text_lower, language)
+        if not hits:
+            return 'neutral', 0.5
+        
+        # Intensity modifier applies to every keyword match in the utterance
+        multiplier = next((m for modifier, m in self.intensity_modifiers.items() if modifier in text_lower), None)
         
         emotion_scores = {}
         
-        # Check each emotion category
-        for emotion, lang_keywords in self.emotion_keywords.items():
+        # Score each emotion category (table order keeps tie-breaking stable)
+        for emotion in self.emotion_keywords:
             score = 0
-            keywords = lang_keywords.get(language, lang_keywords.get('en', []))
-            
-            for keyword in keywords:
-                if keyword in text_lower:
-                    # Base score for keyword match
-                    score += 1
-                    
-                    # Check for intensity modifiers
-                    for modifier, multiplier in self.intensity_modifiers.items():
-                        if modifier in text_lower:
-                            score *= multiplier
-                            break
+            for _ in range(hits.get(emotion, 0)):
+                # Base score for keyword match
+                score += 1
+                if multiplier is not None:
+                    score *= multiplier
             
             if score > 0:
                 emotion_scores[emotion] = score
@@ -206,8 +272,7 @@ Example: happy:0.8"""
                 confidence = 0.7
             
             # Validate emotion
-            valid_emotions = ['angry', 'confused', 'happy', 'sad', 'excited', 'neutral']
-            if emotion not in valid_emotions:
+            if emotion not in VALID_GPT_EMOTIONS:
                 emotion = 'neutral'
                 confidence = 0.5
             
@@ -222,8 +287,9 @@ Example: happy:0.8"""
         if not self.emotion_history:
             return {'current_emotion': 'neutral', 'trend': 'stable', 'intensity': 'medium'}
         
-        recent_emotions = [e[0] for e in self.emotion_history[-3:]]
-        recent_confidences = [e[1] for e in self.emotion_history[-3:]]
+        recent = list(self.emotion_history)[-3:]
+        recent_emotions = [e[0] for e in recent]
+        recent_confidences = [e[1] for e in recent]
         
         # Determine trend
         if len(recent_emotions) >= 2:
@@ -257,25 +323,7 @@ Example: happy:0.8"""
     
     def get_emotion_response_guidance(self, emotion: str, language: str) -> str:
         """Get response guidance based on detected emotion."""
-        if language in ['hi', 'mixed']:
-            guidance = {
-                'angry': 'User is frustrated. Respond with extra patience and empathy. Use calming language like "Chinta mat kariye" and "Main samajh sakti hun".',
-                'confused': 'User is confused. Slow down your response, use simple language, and ask clarifying questions. Use "Step by step kar lete hain".',
-                'happy': 'User is happy. Match their energy slightly while staying professional. Use positive language like "Bahut accha" and "Shabash".',
-                'sad': 'User seems sad or disappointed. Be extra empathetic and supportive. Use comforting language like "Koi baat nahi" and "Main help kar sakti hun".',
-                'excited': 'User is excited. Match their enthusiasm appropriately while staying professional. Use encouraging language.',
-                'neutral': 'Respond normally with warm, helpful tone.'
-            }
-        else:
-            guidance = {
-                'angry': 'User is frustrated. Respond with extra patience and empathy. Use calming language.',
-                'confused': 'User is confused. Slow down your response and use simple language.',
-                'happy': 'User is happy. Match their energy slightly while staying professional.',
-                'sad': 'User seems sad or disappointed. Be extra empathetic and supportive.',
-                'excited': 'User is excited. Match their enthusiasm appropriately while staying professional.',
-                'neutral': 'Respond normally with warm, helpful tone.'
-            }
-        
+        guidance = EMOTION_GUIDANCE_HI if language in ('hi', 'mixed') else EMOTION_GUIDANCE_EN
         return guidance.get(emotion, guidance['neutral'])
     
     def clear_history(self):
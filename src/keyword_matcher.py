@@ -0,0 +1,79 @@
+"""
+Keyword Matcher
+===============
+
+Shared keyword detection for the response handlers and script integration.
+
+Most keywords match as substrings, so inflections like 'booked' or 'problems'
+still hit 'book' and 'problem'. Short keywords that are also fragments of
+common words ('hi' in 'this', 'how' in 'show', 'no' in 'know') are passed as
+whole_words and must match a whole token instead.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+_WORD_RE = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=8)
+def tokenize(text: str) -> frozenset:
+    """Word tokens of text (cached so every detector on the same turn shares one pass)."""
+    return frozenset(_WORD_RE.findall(text))
+
+
+class KeywordMatcher:
+    """
+    Multi-keyword matcher over a {category: keywords} table.
+    
+    Keywords listed in whole_words match whole tokens via frozenset lookups;
+    all other keywords are matched as substrings in one Aho-Corasick pass.
+    """
+    
+    def __init__(self, table: Dict[str, Iterable[str]], whole_words: frozenset = frozenset()):
+        self.table = table
+        self.words = {}
+        self.phrases = {}
+        for category, keywords in table.items():
+            words = frozenset(k for k in keywords if k in whole_words)
+            self.words[category] = words
+            self.phrases[category] = [k for k in keywords if k not in words]
+        self.word_level = any(self.words.values())
+        
+        self.automaton = None
+        if AHOCORASICK_AVAILABLE and any(self.phrases.values()):
+            self.automaton = ahocorasick.Automaton()
+            for category, phrases in self.phrases.items():
+                for phrase in phrases:
+                    categories = self.automaton.get(phrase, ())
+                    self.automaton.add_word(phrase, categories + (category,))
+            self.automaton.make_automaton()
+    
+    def _phrase_hits(self, text: str) -> set:
+        """Categories with a phrase occurring anywhere in text."""
+        if self.automaton is None:
+            return {category for category, phrases in self.phrases.items()
+                    if any(phrase in text for phrase in phrases)}
+        
+        hits = set()
+        for _, categories in self.automaton.iter(text):
+            hits.update(categories)
+        return hits
+    
+    def first_match(self, text: str) -> Optional[str]:
+        """Return the first category (in table order) with a keyword found in lowercased text."""
+        tokens = tokenize(text) if self.word_level else frozenset()
+        phrase_hits = self._phrase_hits(text)
+        
+        for category in self.table:
+            if category in phrase_hits or tokens & self.words[category]:
+                return category
+        return None
@@ -6,9 +6,52 @@ This module provides language detection capabilities for mixed Hindi-English con
 """
 
 import re
+from functools import lru_cache
 from typing import Optional, Tuple
 from src.config import HINDI_BIAS_THRESHOLD, DEFAULT_LANGUAGE
 
+_DEVANAGARI_RE = re.compile(r'[\u0900-\u097F]')
+_LATIN_RE = re.compile(r'[a-zA-Z]')
+
+# Hindi markers used to bias English-looking text toward Hindi
+HINDI_INDICATORS = ('मैं', 'आप', 'है', 'हैं', 'कर', 'करना', 'चाहिए', 'हो', 'होगा')
+HINGLISH_WORDS = ('namaste', 'kaise', 'haan', 'nahi', 'aap', 'kya', 'theek', 'bilkul')
+
+# Common transliterated Hindi words and Hinglish phrases
+HINGLISH_KEYWORDS = (
+    # Pure Hindi transliterations
+    'namaste', 'kaise', 'ho', 'hai', 'haan', 'nahi', 'kripya', 'dhanyavad',
+    'madad', 'samay', 'tarikh', 'pata', 'bhai', 'didi', '',
+    'aap', 'hum', 'mera', 'meri', 'kya', 'kyu', 'kyon', 'kab', 'kahan', 'kidhar',
+    'chahiye', 'chahiyeh', 'karna', 'hoga', 'krna', 'krunga', 'krungi',
+    'mere', 'mujhe', 'tumhe', 'aapko', 'hamein', 'unhein',
+    'dekh', 'dekho', 'bolo', 'batao', 'suno', 'samjho',
+    'theek', 'bilkul', 'zaroor', 'shayad', 'kabhi',
+    'mein', 'me', 'ko', 'se', 'par', 'ke', 'ki', 'ka',
+    'accha', 'acha', 'badhiya', 'sahi', 'thik',
+    'naam', 'umar', 'sheher', 'paisa',
+    # Hindi-English mixed patterns
+    'hotel book', 'room book', 'train book', 'flight book',
+    'booking karo', 'booking karna', 'book karo', 'book karna'
+)
+
+# List of inappropriate words/phrases (both English and Hindi)
+INAPPROPRIATE_WORDS = frozenset({
+    # English inappropriate words
+    'fuck', 'shit', 'damn', 'bitch', 'asshole', 'bastard', 'piss', 'crap',
+    'hell', 'bloody', 'stupid', 'idiot', 'moron', 'retard', 'gay', 'fag',
+    'whore', 'slut', 'prostitute', 'sex', 'porn', 'nude', 'naked',
+    'kill', 'murder', 'suicide', 'die', 'death', 'hate', 'violence',
+    'drug', 'cocaine', 'heroin', 'marijuana', 'weed', 'alcohol',
+    'rape', 'molest', 'abuse', 'harass', 'threat', 'blackmail',
+    
+    # Hindi inappropriate words (transliterated)
+    'chutiya', 'bhosdike', 'madarchod', 'behenchod', 'lund', 'chut',
+    'gaand', 'bhenchod', 'maa ki', 'teri maa', 'saala', 'saali',
+    'randi', 'raand', 'kutiya', 'kutta', 'kamina', 'harami',
+    'chakka', 'hijra', 'napunsak', 'murda', 'kutte', 'machod'
+})
+
 def detect_language_with_phone_bias(text: str, phone_number: str = None) -> str:
     """
     Detect language with phone number country code bias and Hindi preference.
@@ -26,10 +69,7 @@ def detect_language_with_phone_bias(text: str, phone_number: str = None) -> str:
         basic_detection = detect_language(text)
         if basic_detection == 'en':
             # Double-check for Hindi indicators (both Devanagari and Latin script)
-            hindi_indicators = ['मैं', 'आप', 'है', 'हैं', 'कर', 'करना', 'चाहिए', 'हो', 'होगा']
-            hinglish_words = ['namaste', 'kaise', 'haan', 'nahi', 'aap', 'kya', 'theek', 'bilkul']
-            
-            if any(word in text for word in hindi_indicators) or any(word in text.lower() for word in hinglish_words):
+            if any(word in text for word in HINDI_INDICATORS) or any(word in text.lower() for word in HINGLISH_WORDS):
                 return 'hi'
         return basic_detection
     
@@ -63,18 +103,19 @@ def detect_language_with_bias(text: str, hindi_bias_threshold: float = HINDI_BIA
             return 'hi'  # Bias mixed toward Hindi
         elif basic_detection == 'en':
             # Check for Hindi indicators even in English text
-            hindi_indicators = ['मैं', 'आप', 'है', 'हैं', 'कर', 'करना', 'चाहिए', 'हो', 'होगा']
-            hinglish_words = ['namaste', 'kaise', 'haan', 'nahi', 'aap', 'kya', 'theek', 'bilkul']
-            
-            if any(word in text for word in hindi_indicators) or any(word in text.lower() for word in hinglish_words):
+            if any(word in text for word in HINDI_INDICATORS) or any(word in text.lower() for word in HINGLISH_WORDS):
                 return 'hi'
     
     return basic_detection
 
+@lru_cache(maxsize=512)
 def detect_language(text: str) -> str:
     """
     Detect if text is primarily Hindi, English, or mixed.
     
+    Results are memoized, since the same utterance is usually classified
+    several times per turn (brain, TTS, STT).
+    
     Args:
         text: Input text to analyze
         
@@ -88,12 +129,10 @@ def detect_language(text: str) -> str:
     text = text.strip()
     
     # Count Devanagari characters (Hindi script)
-    devanagari_pattern = r'[\u0900-\u097F]'
-    hindi_chars = len(re.findall(devanagari_pattern, text))
+    hindi_chars = len(_DEVANAGARI_RE.findall(text))
     
     # Count Latin characters (English script)
-    latin_pattern = r'[a-zA-Z]'
-    english_chars = len(re.findall(latin_pattern, text))
+    english_chars = len(_LATIN_RE.findall(text))
     
     # Count total meaningful characters
     total_chars = hindi_chars + english_chars
@@ -107,26 +146,8 @@ def detect_language(text: str) -> str:
     
     # Quick Hinglish heuristic: Latin script but contains common Hindi words transliterated
     lower_text = text.lower()
-    hinglish_hits = 0
-    hinglish_keywords = [
-        # Pure Hindi transliterations
-        'namaste', 'kaise', 'ho', 'hai', 'haan', 'nahi', 'kripya', 'dhanyavad',
-        'madad', 'samay', 'tarikh', 'pata', 'bhai', 'didi', '',
-        'aap', 'hum', 'mera', 'meri', 'kya', 'kyu', 'kyon', 'kab', 'kahan', 'kidhar',
-        'chahiye', 'chahiyeh', 'karna', 'hoga', 'krna', 'krunga', 'krungi',
-        'mere', 'mujhe', 'tumhe', 'aapko', 'hamein', 'unhein',
-        'dekh', 'dekho', 'bolo', 'batao', 'suno', 'samjho',
-        'theek', 'bilkul', 'zaroor', 'shayad', 'kabhi',
-        'mein', 'me', 'ko', 'se', 'par', 'ke', 'ki', 'ka',
-        'accha', 'acha', 'badhiya', 'sahi', 'thik',
-        'naam', 'umar', 'sheher', 'paisa',
-        # Hindi-English mixed patterns
-        'hotel book', 'room book', 'train book', 'flight book',
-        'booking karo', 'booking karna', 'book karo', 'book karna'
-    ]
-    for kw in hinglish_keywords:
-        if kw in lower_text:
-            hinglish_hits += 1
+    # map() keeps the containment count loop in C
+    hinglish_hits = sum(map(lower_text.__contains__, HINGLISH_KEYWORDS))
     # Determine language based on thresholds and hints (Master Branch Logic)
     if hindi_percentage >= 60:
         return 'hi'
@@ -141,18 +162,8 @@ def detect_language(text: str) -> str:
     else:
         return 'mixed'
 
-def get_language_prompt(language: str) -> str:
-    """
-    Get appropriate system prompt based on detected language for Sara.
-    
-    Args:
-        language: Language code ('hi', 'en', 'mixed')
-        
-    Returns:
-        System prompt text
-    """
-    prompts = {
-        'hi': """You are Sara, a friendly female AI assistant.
+LANGUAGE_PROMPTS = {
+    'hi': """You are Sara, a friendly female AI assistant.
 
 CRITICAL: Respond in Romanized Hinglish (Hindi words in English script).
 Examples:
@@ -164,16 +175,16 @@ Examples:
 - "Kitne din ke liye stay karna hai?"
 
 Be warm, helpful, and conversational. Ask one question at a time.""",
-        
-        'en': """You are Sara, a friendly and helpful female AI assistant. You can help with:
+    
+    'en': """You are Sara, a friendly and helpful female AI assistant. You can help with:
 - Restaurant bookings and recommendations
 - Hotel reservations and travel planning
 - General questions and conversations
 - Booking assistance and guidance
 
 Be warm, friendly, and conversational. Speak naturally as a helpful female assistant. If someone uses inappropriate language or makes inappropriate requests, politely decline and offer to help with appropriate topics instead. Always maintain a professional and respectful tone.""",
-        
-        'mixed': """You are Sara, a friendly female AI assistant.
+    
+    'mixed': """You are Sara, a friendly female AI assistant.
 
 CRITICAL: Respond in Romanized Hinglish (Hindi words in English script).
 Examples:
@@ -186,9 +197,19 @@ Examples:
 - "Great! Main aapko best options deti hun"
 
 Be warm, helpful, and conversational. Ask one question at a time."""
-    }
+}
+
+def get_language_prompt(language: str) -> str:
+    """
+    Get appropriate system prompt based on detected language for Sara.
     
-    return prompts.get(language, prompts['en'])
+    Args:
+        language: Language code ('hi', 'en', 'mixed')
+        
+    Returns:
+        System prompt text
+    """
+    return LANGUAGE_PROMPTS.get(language, LANGUAGE_PROMPTS['en'])
 
 def detect_inappropriate_content(text: str) -> bool:
     """
@@ -206,35 +227,16 @@ def detect_inappropriate_content(text: str) -> bool:
     # Convert to lowercase for case-insensitive matching
     lower_text = text.lower().strip()
     
-    # List of inappropriate words/phrases (both English and Hindi)
-    inappropriate_words = [
-        # English inappropriate words
-        'fuck', 'shit', 'damn', 'bitch', 'asshole', 'bastard', 'piss', 'crap',
-        'hell', 'bloody', 'stupid', 'idiot', 'moron', 'retard', 'gay', 'fag',
-        'whore', 'slut', 'prostitute', 'sex', 'porn', 'nude', 'naked',
-        'kill', 'murder', 'suicide', 'die', 'death', 'hate', 'violence',
-        'drug', 'cocaine', 'heroin', 'marijuana', 'weed', 'alcohol',
-        'rape', 'molest', 'abuse', 'harass', 'threat', 'blackmail',
-        
-        # Hindi inappropriate words (transliterated)
-        'chutiya', 'bhosdike', 'madarchod', 'behenchod', 'lund', 'chut',
-        'gaand', 'bhenchod', 'maa ki', 'teri maa', 'saala', 'saali',
-        'randi', 'raand', 'kutiya', 'kutta', 'kamina', 'harami',
-        'chakka', 'hijra', 'napunsak', 'murda', 'kutta', 'kutte',
-        'machod', 'bhenchod', 'behenchod', 'madarchod', 'bhosdike',
-        'chutiya', 'chut', 'lund', 'gaand', 'saala', 'saali'
-    ]
-    
     # Check for inappropriate words (exact word matches only)
-    words_in_text = lower_text.split()
-    inappropriate_found = False
+    return not INAPPROPRIATE_WORDS.isdisjoint(lower_text.split())
+
+APPROPRIATE_RESPONSES = {
+    'hi': "Main aapki madad karne ke liye yahan hun, lekin kripya uchit bhasha ka prayog karein. Main aapke saath sammanjanak tareeke se baat karna chahti hun. Kya main aapki kisi aur tareeke se madad kar sakti hun?",
     
-    for word in inappropriate_words:
-        if word in words_in_text:  # Only exact word matches
-            inappropriate_found = True
-            break
+    'en': "I'm here to help you, but please use appropriate language. I'd like to have a respectful conversation with you. Is there something else I can help you with?",
     
-    return inappropriate_found
+    'mixed': "I'm here to help you, but please use appropriate language. I'd like to have a respectful conversation with you. Is there something else I can help you with?"
+}
 
 def get_appropriate_response(language: str) -> str:
     """
@@ -246,15 +248,13 @@ def get_appropriate_response(language: str) -> str:
     Returns:
         Appropriate response text
     """
-    responses = {
-        'hi': "Main aapki madad karne ke liye yahan hun, lekin kripya uchit bhasha ka prayog karein. Main aapke saath sammanjanak tareeke se baat karna chahti hun. Kya main aapki kisi aur tareeke se madad kar sakti hun?",
-        
-        'en': "I'm here to help you, but please use appropriate language. I'd like to have a respectful conversation with you. Is there something else I can help you with?",
-        
-        'mixed': "I'm here to help you, but please use appropriate language. I'd like to have a respectful conversation with you. Is there something else I can help you with?"
-    }
-    
-    return responses.get(language, responses['en'])
+    return APPROPRIATE_RESPONSES.get(language, APPROPRIATE_RESPONSES['en'])
+
+TTS_VOICES = {
+    'hi': 'hi',      # Hindi
+    'en': 'en',      # English
+    'mixed': 'en'    # Default to English for mixed
+}
 
 def get_tts_voice(language: str) -> str:
     """
@@ -266,13 +266,7 @@ def get_tts_voice(language: str) -> str:
     Returns:
         TTS voice code
     """
-    voices = {
-        'hi': 'hi',      # Hindi
-        'en': 'en',      # English
-        'mixed': 'en'    # Default to English for mixed
-    }
-    
-    return voices.get(language, 'en')
+    return TTS_VOICES.get(language, 'en')
 
 def is_hindi_text(text: str) -> bool:
     """
@@ -284,8 +278,7 @@ def is_hindi_text(text: str) -> bool:
     Returns:
         True if text contains Hindi characters
     """
-    devanagari_pattern = r'[\u0900-\u097F]'
-    return bool(re.search(devanagari_pattern, text))
+    return _DEVANAGARI_RE.search(text) is not None
 
 def is_english_text(text: str) -> bool:
     """
@@ -297,8 +290,13 @@ def is_english_text(text: str) -> bool:
     Returns:
         True if text contains English characters
     """
-    latin_pattern = r'[a-zA-Z]'
-    return bool(re.search(latin_pattern, text))
+    return _LATIN_RE.search(text) is not None
+
+GREETINGS = {
+    'hi': "Namaste! Main Sara hun, aapki madad kar sakti hun. Aaj main aapki kaise help kar sakti hun?",
+    'en': "Hello! I'm Sara, your AI assistant. How can I help you today?",
+    'mixed': "Hello! Namaste! Main Sara hun, aapki madad kar sakti hun. How can I help you today?"
+}
 
 def get_greeting(language: str) -> str:
     """
@@ -310,13 +308,13 @@ def get_greeting(language: str) -> str:
     Returns:
         Greeting text
     """
-    greetings = {
-        'hi': "Namaste! Main Sara hun, aapki madad kar sakti hun. Aaj main aapki kaise help kar sakti hun?",
-        'en': "Hello! I'm Sara, your AI assistant. How can I help you today?",
-        'mixed': "Hello! Namaste! Main Sara hun, aapki madad kar sakti hun. How can I help you today?"
-    }
-    
-    return greetings.get(language, greetings['en'])
+    return GREETINGS.get(language, GREETINGS['en'])
+
+FALLBACK_MESSAGES = {
+    'hi': "Mujhe samajh nahi aaya. Kripya dobara kahiye.",
+    'en': "I didn't catch that. Please try again.",
+    'mixed': "I didn't catch that. Mujhe samajh nahi aaya. Please try again."
+}
 
 def get_fallback_message(language: str) -> str:
     """
@@ -328,10 +326,4 @@ def get_fallback_message(language: str) -> str:
     Returns:
         Fallback message text
     """
-    messages = {
-        'hi': "Mujhe samajh nahi aaya. Kripya dobara kahiye.",
-        'en': "I didn't catch that. Please try again.",
-        'mixed': "I didn't catch that. Mujhe samajh nahi aaya. Please try again."
-    }
-    
-    return messages.get(language, messages['en'])
+    return FALLBACK_MESSAGES.get(language, FALLBACK_MESSAGES['en'])
@@ -38,8 +38,12 @@ class MixedAIProvider(ABC):
     """Abstract base class for mixed language AI providers"""
     
     @abstractmethod
-    def ask(self, user_text: str, language: str = None) -> str:
-        """Process user input and return AI response in appropriate language"""
+    def ask(self, user_text: str, language: str = None, system_prompt: str = None) -> str:
+        """
+        Process user input and return AI response in appropriate language
+        
+        system_prompt, if given, replaces the system prompt for this request only.
+        """
         pass
     
     def ask_stream(self, user_text: str, language: str = None):
@@ -67,14 +71,14 @@ class MixedOpenAIProvider(MixedAIProvider):
         print(f"🧠 Mixed OpenAI Provider initialized with {model}")
     
     @log_timing("AI response (OpenAI)")
-    def ask(self, user_text: str, language: str = None) -> str:
+    def ask(self, user_text: str, language: str = None, system_prompt: str = None) -> str:
         """Process user input with OpenAI and respond in appropriate language"""
         # Detect language if not specified
         if language is None:
             language = detect_language(user_text)
         
         # Get appropriate system prompt
-        system_prompt = get_language_prompt(language)
+        language_prompt = get_language_prompt(language)
         
         # Add language instruction based on detected language
         if language in ['hi', 'mixed']:
@@ -83,7 +87,7 @@ class MixedOpenAIProvider(MixedAIProvider):
             language_instruction = "\n\nRespond in English."
         
         # Append language instruction to system prompt
-        enhanced_prompt = system_prompt + language_instruction
+        enhanced_prompt = language_prompt + language_instruction
         
         # Add system prompt if this is the first message
         if not self.history:
@@ -92,10 +96,15 @@ class MixedOpenAIProvider(MixedAIProvider):
         # Add user message
         self.history.append({"role": "user", "content": user_text})
         
+        # Per-request system prompt override leaves the stored history untouched
+        messages = self.history
+        if system_prompt is not None:
+            messages = [{"role": "system", "content": system_prompt}] + self.history[1:]
+        
         try:
             completion = self.client.chat.completions.create(
                 model=self.model,
-                messages=self.history,
+                messages=messages,
                 temperature=0.6,
             )
             
@@ -181,14 +190,14 @@ class MixedGeminiProvider(MixedAIProvider):
         self.history = []
         print(f"🧠 Mixed Gemini Provider initialized with {model_name}")
     
-    def ask(self, user_text: str, language: str = None) -> str:
+    def ask(self, user_text: str, language: str = None, system_prompt: str = None) -> str:
         """Process user input with Gemini and respond in appropriate language"""
         # Detect language if not specified
         if language is None:
             language = detect_language(user_text)
         
         # Get appropriate system prompt
-        system_prompt = get_language_prompt(language)
+        language_prompt = get_language_prompt(language)
         
         # Add language instruction based on detected language
         if language in ['hi', 'mixed']:
@@ -197,11 +206,16 @@ class MixedGeminiProvider(MixedAIProvider):
             language_instruction = "\n\nRespond in English."
         
         # Append language instruction to system prompt
-        enhanced_prompt = system_prompt + language_instruction
+        enhanced_prompt = language_prompt + language_instruction
         
         try:
             # Create conversation context
-            if not self.history:
+            if system_prompt is not None:
+                # Per-request system prompt override
+                response = self.model.generate_content(
+                    f"{system_prompt}\n\nUser: {user_text}"
+                )
+            elif not self.history:
                 # First message - include system prompt
                 response = self.model.generate_content(
                     f"{enhanced_prompt}\n\nUser: {user_text}"
@@ -243,10 +257,10 @@ class MixedAIBrain:
             print(f"⚠️ Unknown provider '{provider}', defaulting to OpenAI")
             return MixedOpenAIProvider()
     
-    def ask(self, user_text: str, language: str = None) -> str:
+    def ask(self, user_text: str, language: str = None, system_prompt: str = None) -> str:
         """Process user input with mixed language support"""
         try:
-            return self.provider.ask(user_text, language)
+            return self.provider.ask(user_text, language, system_prompt)
         except Exception as e:
             print(f"❌ Error with {self.provider_name}: {e}")
             # Fallback to OpenAI if Gemini fails
@@ -254,7 +268,7 @@ class MixedAIBrain:
                 print("🔄 Falling back to OpenAI...")
                 try:
                     fallback_provider = MixedOpenAIProvider()
-                    return fallback_provider.ask(user_text, language)
+                    return fallback_provider.ask(user_text, language, system_prompt)
                 except Exception as fallback_error:
                     detected_lang = detect_language(user_text) if language is None else language
                     return get_fallback_message(detected_lang)
@@ -152,6 +152,7 @@ class ProductService:
         
         return {
             'product_id': str(data.get('_id', '')),
+            'updated_at': data.get('updatedAt'),
             'name': product_name,
             'brand': brand_name,
             'description': data.get('description', ''),
@@ -202,6 +203,7 @@ class ProductService:
         
         return {
             'product_id': str(data.get('_id', '')),
+            'updated_at': data.get('updatedAt'),
             'name': product_name,
             'brand': '',
             'description': data.get('description', ''),
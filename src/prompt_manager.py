@@ -17,6 +17,7 @@ class PromptManager:
     def __init__(self, prompts_dir: str = "prompts"):
         self.prompts_dir = Path(prompts_dir)
         self._cache = {}
+        self._context_cache = {}
         
     def load_prompt(self, template_name: str) -> str:
         """Load a prompt template from file."""
@@ -46,6 +47,9 @@ class PromptManager:
         Returns:
             Combined prompt string
         """
+        if context in self._context_cache:
+            return self._context_cache[context]
+        
         # Load core persona
         core_persona = self.load_prompt("core_persona")
         
@@ -54,6 +58,7 @@ class PromptManager:
         
         # Combine them
         combined_prompt = f"{core_persona}\n\n{context_prompt}"
+        self._context_cache[context] = combined_prompt
         
         return combined_prompt
     
@@ -68,6 +73,7 @@ class PromptManager:
     def clear_cache(self):
         """Clear the prompt cache."""
         self._cache.clear()
+        self._context_cache.clear()
     
     def reload_prompts(self):
         """Reload all prompts from files."""
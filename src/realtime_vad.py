@@ -11,7 +11,7 @@ import threading
 import queue
 import collections
 import logging
-from typing import Optional, Callable, List
+from typing import Optional, Callable, List, Tuple
 import numpy as np
 
 try:
@@ -221,16 +221,84 @@ class InterruptionHandler:
         self.speech_buffer.clear()
 
 
+class AudioRingBuffer:
+    """Preallocated float32 ring buffer shared by every stage of a call's audio pipeline"""
+    
+    def __init__(self, sample_rate: int = 16000, duration: float = 30.0):
+        """
+        Initialize ring buffer
+        
+        Args:
+            sample_rate: Audio sample rate
+            duration: Seconds of audio the ring can hold before wrapping
+        """
+        self.capacity = int(sample_rate * duration)
+        self.buffer = np.zeros(self.capacity, dtype=np.float32)
+        self.write_pos = 0  # Absolute number of samples written so far
+    
+    def write(self, audio_chunk: np.ndarray) -> Tuple[int, int]:
+        """
+        Copy an audio chunk into the ring
+        
+        Args:
+            audio_chunk: float32 samples, or int16 PCM samples (scaled to [-1, 1))
+            
+        Returns:
+            (start, length) span addressing the chunk inside the ring
+        """
+        length = len(audio_chunk)
+        if length > self.capacity:
+            audio_chunk = audio_chunk[-self.capacity:]
+            length = self.capacity
+        
+        start = self.write_pos
+        index = start % self.capacity
+        first = min(length, self.capacity - index)
+        self._copy_in(self.buffer[index:index + first], audio_chunk[:first])
+        if first < length:
+            self._copy_in(self.buffer[:length - first], audio_chunk[first:])
+        
+        self.write_pos = start + length
+        return start, length
+    
+    def write_pcm16(self, pcm_bytes: bytes) -> Tuple[int, int]:
+        """Decode 16-bit PCM straight into the ring without an intermediate array"""
+        return self.write(np.frombuffer(pcm_bytes, dtype=np.int16))
+    
+    def view(self, start: int, length: int) -> np.ndarray:
+        """
+        Get the samples for a span
+        
+        Returns a zero-copy view unless the span wraps around the end of the ring.
+        """
+        length = min(length, self.capacity)
+        index = start % self.capacity
+        end = index + length
+        if end <= self.capacity:
+            return self.buffer[index:end]
+        return np.concatenate((self.buffer[index:], self.buffer[:end - self.capacity]))
+    
+    @staticmethod
+    def _copy_in(target: np.ndarray, source: np.ndarray):
+        """Copy samples into a ring slice, scaling int16 PCM to float32"""
+        if source.dtype == np.int16:
+            np.multiply(source, 1.0 / 32768.0, out=target, casting='unsafe')
+        else:
+            target[:] = source
+
+
 class RealtimeConversationManager:
     """Manages real-time conversation flow with interruption handling"""
     
-    def __init__(self, sample_rate: int = 16000, chunk_duration: float = 0.1):
+    def __init__(self, sample_rate: int = 16000, chunk_duration: float = 0.1,
+                 buffer_duration: float = 30.0):
         """
         Initialize conversation manager
         
         Args:
             sample_rate: Audio sample rate
             chunk_duration: Duration of each audio chunk in seconds
+            buffer_duration: Seconds of audio kept in the shared ring buffer
         """
         self.sample_rate = sample_rate
         self.chunk_duration = chunk_duration
@@ -240,7 +308,8 @@ class RealtimeConversationManager:
         self.vad = VoiceActivityDetector(sample_rate=sample_rate)
         self.interruption_handler = InterruptionHandler(self.vad)
         
-        # Audio processing
+        # Audio processing - chunks live in the ring, the queue carries (start, length) spans
+        self.audio_buffer = AudioRingBuffer(sample_rate, buffer_duration)
         self.audio_queue = queue.Queue()
         self.is_running = False
         self.processing_thread = None
@@ -276,7 +345,12 @@ class RealtimeConversationManager:
     def add_audio_chunk(self, audio_chunk: np.ndarray):
         """Add audio chunk for processing"""
         if self.is_running:
-            self.audio_queue.put(audio_chunk)
+            self.audio_queue.put(self.audio_buffer.write(audio_chunk))
+    
+    def add_pcm16_chunk(self, pcm_bytes: bytes):
+        """Add raw 16-bit PCM audio for processing, decoding it directly into the ring"""
+        if self.is_running:
+            self.audio_queue.put(self.audio_buffer.write_pcm16(pcm_bytes))
     
     def start_bot_response(self, tts_process=None):
         """Indicate bot started speaking"""
@@ -290,34 +364,43 @@ class RealtimeConversationManager:
         """Main processing loop for audio chunks"""
         logger.info("🔄 Audio processing loop started")
         
-        speech_chunks = []
+        speech_start = None  # Ring offset of the first speech chunk in the utterance
+        speech_end = 0
         silence_duration = 0
         max_silence = 1.0  # seconds of silence before processing speech
+        # Flush with half the ring still ahead of the utterance, so queued chunks
+        # and the span handed to STT can't be overwritten by the producer
+        max_speech = self.audio_buffer.capacity // 2
         
         while self.is_running:
             try:
-                # Get audio chunk with timeout
-                audio_chunk = self.audio_queue.get(timeout=0.1)
+                # Get audio span with timeout and view it in place
+                start, length = self.audio_queue.get(timeout=0.1)
+                audio_chunk = self.audio_buffer.view(start, length)
                 
                 # Process for interruption detection
                 result = self.interruption_handler.process_audio_chunk(audio_chunk)
                 
-                # Accumulate speech chunks
+                # Extend the speech span
                 if result['is_speech'] and not self.interruption_handler.is_bot_speaking:
-                    speech_chunks.append(audio_chunk)
+                    if speech_start is None:
+                        speech_start = start
+                    speech_end = start + length
                     silence_duration = 0
                 else:
                     silence_duration += self.chunk_duration
                 
                 # Process accumulated speech if silence detected
-                if speech_chunks and silence_duration >= max_silence:
-                    combined_audio = np.concatenate(speech_chunks)
+                if speech_start is not None and (silence_duration >= max_silence
+                                                 or speech_end - speech_start >= max_speech):
+                    # Copy out: the callback runs STT while the producer keeps writing to the ring
+                    combined_audio = self.audio_buffer.view(speech_start, speech_end - speech_start).copy()
                     
                     if self.on_speech_detected:
                         self.on_speech_detected(combined_audio)
                     
                     # Clear accumulated speech
-                    speech_chunks = []
+                    speech_start = None
                     silence_duration = 0
                 
             except queue.Empty:
@@ -355,18 +355,17 @@ class RealtimeVoiceBot:
     def process_twilio_audio(self, audio_data: bytes, media_format: str = 'mulaw'):
         """Process audio from Twilio Media Streams"""
         try:
-            # Convert Twilio audio format to numpy array
+            # Convert Twilio audio format to linear PCM
             if media_format == 'mulaw':
                 # Decode μ-law to linear PCM
                 import audioop
                 linear_data = audioop.ulaw2lin(audio_data, 2)
-                audio_array = np.frombuffer(linear_data, dtype=np.int16).astype(np.float32) / 32768.0
             else:
                 # Assume linear PCM
-                audio_array = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+                linear_data = audio_data
             
-            # Send to conversation manager
-            self.conversation_manager.add_audio_chunk(audio_array)
+            # Send to conversation manager, which decodes straight into its ring buffer
+            self.conversation_manager.add_pcm16_chunk(linear_data)
             
         except Exception as e:
             logger.error(f"❌ Error processing Twilio audio: {e}")
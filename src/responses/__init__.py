@@ -5,7 +5,7 @@ Response Module
 Main module for the responses package.
 """
 
-from .response_factory import ResponseFactory, get_response_factory, generate_response, get_greeting
+from .response_factory import ResponseFactory, get_response_factory, generate_response, get_greeting, end_call
 from .legacy_response import LegacyResponseHandler
 from .humanized_response import HumanizedResponseHandler
 
@@ -15,7 +15,8 @@ __all__ = [
     'HumanizedResponseHandler',
     'get_response_factory',
     'generate_response',
-    'get_greeting'
+    'get_greeting',
+    'end_call'
 ]
 
 
@@ -7,23 +7,293 @@ Intent Detection → Emotion Context → Personality Filter → AI Generation 
 """
 
 import os
+import random
+import re
+import threading
 import time
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
+from typing import Optional, Dict, Any, NamedTuple
 from src.mixed_ai_brain import MixedAIBrain
 from src.language_detector import detect_language
 from src.prompt_manager import get_context_prompt
 from src.config import get_humanization_config
+from src.keyword_matcher import KeywordMatcher
 from src.script_integration import script_integration
 
+# Conversation memory is optional for script selection; resolved once at import
+try:
+    from src.conversation_memory import get_conversation_memory as _get_conversation_memory
+except Exception:
+    _get_conversation_memory = None
+
+# Optional out-of-process analyzer; resolved once so turns don't retry a failing import
+try:
+    from src.async_processor import process_user_input_async as _async_process_user_input
+except ImportError:
+    _async_process_user_input = None
+
+
+# Languages answered in Romanized Hinglish
+_HI_LANGS = frozenset({'hi', 'mixed'})
+
+# Keyword tables - source of truth for detection, checked in declaration order
+INTENT_KEYWORDS = {
+    'greeting': ['hello', 'hi', 'namaste', 'good morning', 'good afternoon'],
+    'booking': ['book', 'reserve', 'booking', 'reservation', 'book karo'],
+    'inquiry': ['what', 'how', 'when', 'where', 'kya', 'kaise', 'kab'],
+    'confirmation': ['yes', 'no', 'okay', 'sure', 'haan', 'nahi', 'theek'],
+    'complaint': ['problem', 'issue', 'complaint', 'wrong', 'bad', 'problem hai'],
+    'support': ['help', 'support', 'assistance', 'madad', 'help chahiye'],
+    'goodbye': ['bye', 'goodbye', 'see you', 'thank you', 'alvida']
+}
+
+EMOTION_KEYWORDS = {
+    'angry': ['angry', 'frustrated', 'upset', 'annoyed', 'gussa', 'pareshan', 'problem'],
+    'confused': ['confused', 'don\'t understand', 'samajh nahi', 'kaise', 'kya', 'kahan'],
+    'happy': ['great', 'good', 'perfect', 'accha', 'shabash', 'wonderful', 'excellent']
+}
+
+# Any Devanagari character marks Hindi (covers every former indicator word: मैं, आप, है, ...)
+_DEVANAGARI_RE = re.compile(r'[\u0900-\u097F]')
+
+
+# Short keywords that must match a whole token (see src.keyword_matcher)
+_WHOLE_WORD_KEYWORDS = frozenset({'hi', 'no', 'how', 'what', 'when', 'where', 'yes', 'sure', 'kab', 'good'})
+
+
+# Matchers and conversion patterns are built on first use, not at import, so short-lived
+# workers don't pay for structures they never touch
+@cache
+def _intent_matcher() -> KeywordMatcher:
+    return KeywordMatcher(INTENT_KEYWORDS, whole_words=_WHOLE_WORD_KEYWORDS)
+
+
+@cache
+def _emotion_matcher() -> KeywordMatcher:
+    return KeywordMatcher(EMOTION_KEYWORDS, whole_words=_WHOLE_WORD_KEYWORDS)
+
+# Written → spoken phrase conversions
+SPOKEN_HI_CONVERSIONS = {
+    'Please provide your name': 'Aapka naam bata dijiyega?',
+    'Please wait': 'Thoda rukiyega',
+    'I will help you': 'Main help karti hoon',
+    'Thank you': 'Dhanyawad',
+    'You are welcome': 'Koi baat nahi',
+    'I understand': 'Main samajh sakti hun',
+    'Let me check': 'Main check kar leti hoon',
+    'One moment': 'Ek second',
+    'Of course': 'Bilkul',
+    'Absolutely': 'Zarur'
+}
+
+SPOKEN_EN_CONVERSIONS = {
+    'Please provide your name': 'Could you tell me your name?',
+    'Please wait': 'Just a moment',
+    'I will help you': 'I\'ll help you with that',
+    'Thank you': 'Thanks',
+    'You are welcome': 'No problem',
+    'I understand': 'I get it',
+    'Let me check': 'Let me look that up',
+    'One moment': 'One sec',
+    'Of course': 'Sure thing',
+    'Absolutely': 'Definitely'
+}
+
+
+@cache
+def _spoken_conversions(hindi: bool):
+    """(pattern, table) for spoken-tone conversion, one alternation with longest phrase first."""
+    conversions = SPOKEN_HI_CONVERSIONS if hindi else SPOKEN_EN_CONVERSIONS
+    phrases = sorted(conversions, key=len, reverse=True)
+    return re.compile('|'.join(re.escape(phrase) for phrase in phrases)), conversions
+
+# Break points inside a long sentence: commas first, otherwise the first conjunction found
+_MICRO_SENTENCE_WORDS = 12
+_CONJUNCTIONS = (' aur ', ' and ', ' lekin ', ' but ', ' ya ', ' or ')
+
+
+def _iter_micro_sentences(text: str):
+    """Yield the micro-sentences of text, breaking long sentences at commas or a conjunction."""
+    # Split on common sentence boundaries
+    for sentence in text.split('. '):
+        if len(sentence.split()) <= _MICRO_SENTENCE_WORDS:
+            yield sentence
+            continue
+        
+        # Long sentence: split into smaller parts
+        parts = sentence.split(', ')
+        if len(parts) > 1:
+            yield from parts
+            continue
+        
+        # Split on conjunctions
+        for conj in _CONJUNCTIONS:
+            if conj in sentence:
+                yield from sentence.split(conj)
+                break
+        else:
+            yield sentence
+
+# Contextual fillers per emotion
+FILLERS_HI = {
+    'angry': ('Hmm, samjha main', 'Theek hai '),
+    'confused': ('Achha', 'Dekho'),
+    'happy': ('Bilkul', 'Zarur'),
+    'neutral': ('Haan', 'Theek hai')
+}
+
+FILLERS_EN = {
+    'angry': ('I understand', 'Let me help'),
+    'confused': ('I see', 'Let me explain'),
+    'happy': ('Great', 'Perfect'),
+    'neutral': ('Sure', 'Okay')
+}
+
+GREETINGS_HI = (
+    "Namaste! Main Sara hun. Aapka din kaise chal raha hai?",
+    "Hello! Main Sara hun. Kaise hain aap?",
+    "Namaste! Main Sara hun, aapki madad ke liye."
+)
+
+GREETINGS_EN = (
+    "Hello! I'm Sara. How are you doing today?",
+    "Hi there! I'm Sara, how can I help you?",
+    "Hello! I'm Sara, here to assist you."
+)
+
+_RNG = random.Random()
+
+# Shared worker pool for concurrent reply-path work (script lookup)
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='humanizer')
+
+# GPT sentiment recalibration runs one check at a time on its own worker, so the shared
+# sentiment brain needs no lock and slow checks never hold up _EXECUTOR
+_SENTIMENT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='humanizer-sentiment')
+
+# Per-call turn state is kept for at most this many calls; the least recently active is dropped
+_MAX_TRACKED_CALLS = 256
+
+
+# Canned replies for short, context-free utterances - answered without an LLM round trip.
+# Confirmations ("yes", "haan", "nahi") are deliberately absent: their meaning depends on
+# the question the bot just asked, so they still go through the full pipeline.
+_HELLO_REPLY = {'hi': "Haan ji, main sun rahi hun. Boliye?", 'en': "Yes, I'm listening. Go ahead."}
+_NAMASTE_REPLY = {'hi': "Namaste ji! Boliye, main kya madad kar sakti hun?", 'en': "Namaste! How can I help you?"}
+_THANKS_REPLY = {'hi': "Koi baat nahi! Aur kuch madad chahiye?", 'en': "You're welcome! Anything else I can help with?"}
+_BYE_REPLY = {'hi': "Dhanyawad! Aapka din shubh ho.", 'en': "Thanks for calling! Have a great day."}
+_REPEAT_REPLY = {'hi': "Maaf kijiye, main sun nahi paayi. Phir se boliye?", 'en': "Sorry, I didn't catch that. Could you say it again?"}
+
+SHORT_REPLIES = {
+    '': _REPEAT_REPLY,  # empty or punctuation-only transcript
+    'hello': _HELLO_REPLY,
+    'hi': _HELLO_REPLY,
+    'namaste': _NAMASTE_REPLY,
+    'thank you': _THANKS_REPLY,
+    'thanks': _THANKS_REPLY,
+    'dhanyawad': _THANKS_REPLY,
+    'dhanyavad': _THANKS_REPLY,
+    'bye': _BYE_REPLY,
+    'goodbye': _BYE_REPLY,
+    'alvida': _BYE_REPLY
+}
+_SHORT_UTTERANCE_MAX_CHARS = 12
+
+# Emotion-specific response instructions
+EMOTION_INSTRUCTIONS_HI = {
+    'angry': 'User is frustrated. Respond with extra patience and empathy. Use calming language like "Chinta mat kariye" and "Main samajh sakti hun".',
+    'confused': 'User is confused. Slow down your response, use simple language, and ask clarifying questions. Use "Step by step kar lete hain".',
+    'happy': 'User is happy. Match their energy slightly while staying professional. Use positive language like "Bahut accha" and "Shabash".',
+    'neutral': 'Respond normally with warm, helpful tone.'
+}
+
+EMOTION_INSTRUCTIONS_EN = {
+    'angry': 'User is frustrated. Respond with extra patience and empathy. Use calming language.',
+    'confused': 'User is confused. Slow down your response and use simple language.',
+    'happy': 'User is happy. Match their energy slightly while staying professional.',
+    'neutral': 'Respond normally with warm, helpful tone.'
+}
+
+
+@lru_cache(maxsize=128)
+def _emotion_instructions(emotion: str, language: str) -> str:
+    """Emotion-specific response instructions (cached per emotion/language)."""
+    instructions = EMOTION_INSTRUCTIONS_HI if language in _HI_LANGS else EMOTION_INSTRUCTIONS_EN
+    return instructions.get(emotion, instructions['neutral'])
+
+
+def _personality_prompt(context: str, emotion: str, language: str) -> str:
+    """Context prompt plus emotion instructions (the context prompt is cached by PromptManager)."""
+    # Load context-specific prompt
+    base_prompt = get_context_prompt(context)
+    
+    # Add emotion-specific instructions
+    emotion_instructions = _emotion_instructions(emotion, language)
+    
+    return f"{base_prompt}\n\n{emotion_instructions}"
+
+
+class ProcessingResult(NamedTuple):
+    """Per-turn analysis of the user's input."""
+    emotion: str
+    language: str
+    intent: str
+
 
 class HumanizedResponseHandler:
     """Handles responses using the new humanized approach."""
     
     def __init__(self):
-        self.ai_brain = MixedAIBrain()
         self.config = get_humanization_config()
-        self.turn_count = 0
-        
+        self._call_turns = {}  # call_sid -> turn number, least recently active first
+        self._sentiment_checks = {}  # call_sid -> (turn, future) of a pending GPT sentiment check
+        self._calls_lock = threading.Lock()
+        self._sentiment_brain = None
+        self._sentiment_brain_lock = threading.Lock()
+        self._last_processing = {}  # call_sid -> (user_text, phone_number, ProcessingResult)
+        self._ai_brain = None
+        self._ai_brain_lock = threading.Lock()
+    
+    @property
+    def ai_brain(self) -> MixedAIBrain:
+        """AI brain, created once on first use (the factory's prewarm thread may race a request)."""
+        if self._ai_brain is None:
+            with self._ai_brain_lock:
+                if self._ai_brain is None:
+                    self._ai_brain = MixedAIBrain()
+        return self._ai_brain
+    
+    @property
+    def sentiment_brain(self) -> MixedAIBrain:
+        """Separate brain for GPT sentiment checks, created once on first use."""
+        if self._sentiment_brain is None:
+            with self._sentiment_brain_lock:
+                if self._sentiment_brain is None:
+                    self._sentiment_brain = MixedAIBrain()
+        return self._sentiment_brain
+    
+    def _next_turn(self, call_sid: str) -> int:
+        """Advance and return the turn number of this call."""
+        with self._calls_lock:
+            turn = self._call_turns.pop(call_sid, 0) + 1
+            self._call_turns[call_sid] = turn  # re-insert to keep recency order
+            if len(self._call_turns) > _MAX_TRACKED_CALLS:
+                self._forget_call(next(iter(self._call_turns)))
+        return turn
+    
+    def _forget_call(self, call_sid: str):
+        """Drop the turn state of a call (caller holds _calls_lock)."""
+        self._call_turns.pop(call_sid, None)
+        self._last_processing.pop(call_sid, None)
+        pending = self._sentiment_checks.pop(call_sid, None)
+        if pending is not None:
+            pending[1].cancel()
+    
+    def end_call(self, call_sid: str):
+        """Release the per-call turn state once a call has ended."""
+        with self._calls_lock:
+            self._forget_call(call_sid)
+    
     def generate_response(self, user_text: str, call_sid: str = None, 
                          context: str = "booking", phone_number: str = None, 
                          product_id: str = None, product: Dict = None) -> str:
@@ -41,17 +311,41 @@ class HumanizedResponseHandler:
         Returns:
             Generated response text
         """
-        self.turn_count += 1
+        # Nothing intelligible was transcribed: ask the caller to repeat
+        if not user_text.strip(' \t\n.!?,'):
+            return self._get_short_reply('', phone_number)
         
-        # Step 1: Async Processing (emotion, intent, language detection)
-        processing_result = self._process_user_input_async(user_text, phone_number)
+        # Fast path: short greetings/thanks/goodbyes get a canned reply (scripts still win in sales)
+        if len(user_text) <= _SHORT_UTTERANCE_MAX_CHARS and not (context == "sales" and product_id):
+            short_reply = self._get_short_reply(user_text, phone_number)
+            if short_reply:
+                return short_reply
         
-        # Step 2: Try Script Integration First (for sales context)
+        # Canned replies bypass the AI brain, so only full turns count towards recalibration
+        turn = self._next_turn(call_sid)
+        
+        script_future = None
         if context == "sales" and product_id:
-            script_response = self._try_script_response(
-                product_id, user_text, processing_result.language, 
+            # Script lookup only needs the language, so start it before the full analysis
+            # and let emotion/intent detection run on the same wall clock
+            language = self._detect_language_with_bias(user_text, user_text.lower(), phone_number)
+            script_future = _EXECUTOR.submit(
+                self._try_script_response, product_id, user_text, language,
                 product, call_sid
             )
+        
+        # Step 1: Async Processing (emotion, intent, language detection)
+        # A verbatim repeat of the call's previous turn (common with voice) keeps its classification
+        last_text, last_phone, processing_result = self._last_processing.get(call_sid, (None, None, None))
+        if user_text != last_text or phone_number != last_phone:
+            processing_result = self._process_user_input_async(user_text, phone_number)
+            with self._calls_lock:
+                self._last_processing[call_sid] = (user_text, phone_number, processing_result)
+        processing_result = self._recalibrate_emotion(processing_result, user_text, call_sid, turn)
+        
+        # Step 2: Try Script Integration First (for sales context)
+        if script_future is not None:
+            script_response = script_future.result()
             if script_response:
                 # Apply humanization to script response
                 response = self._apply_humanizer(script_response, processing_result.language, processing_result.emotion)
@@ -70,22 +364,26 @@ class HumanizedResponseHandler:
         
         return response
     
+    def _get_short_reply(self, user_text: str, phone_number: str = None) -> Optional[str]:
+        """Canned reply for a short context-free utterance, or None."""
+        text_lower = user_text.lower()
+        replies = SHORT_REPLIES.get(text_lower.strip(' .!?,'))
+        if replies is None:
+            return None
+        
+        language = self._detect_language_with_bias(user_text, text_lower, phone_number)
+        return replies['hi'] if language in _HI_LANGS else replies['en']
+    
     def _try_script_response(self, product_id: str, user_text: str, language: str, 
                              product: Dict = None, call_sid: str = None) -> Optional[str]:
         """Try to get a script-based response"""
         try:
             # Get conversation history if available
             conversation_history = []
-            if call_sid:
-                # Try to get conversation history from memory
-                try:
-                    from src.conversation_memory import conversation_memory
-                    if hasattr(conversation_memory, 'get_conversation_history'):
-                        history = conversation_memory.get_conversation_history(call_sid)
-                        if history:
-                            conversation_history = history[-5:]  # Last 5 exchanges
-                except Exception:
-                    pass
+            if call_sid and _get_conversation_memory is not None:
+                history = _get_conversation_memory().get_conversation_history(call_sid)
+                if history:
+                    conversation_history = history[-5:]  # Last 5 exchanges
             
             # Get script response
             script_response = script_integration.get_script_response(
@@ -108,8 +406,12 @@ class HumanizedResponseHandler:
     
     def _process_user_input_async(self, user_text: str, phone_number: str = None):
         """Process user input asynchronously for better performance."""
+        if _async_process_user_input is None:
+            # The keyword detectors take microseconds and hold the GIL, so they run
+            # in-thread; I/O-bound work goes to the shared _EXECUTOR instead
+            return self._process_user_input_sync(user_text, phone_number)
+        
         try:
-            from src.async_processor import process_user_input_async
             from src.conversation_memory import get_recent_conversation_history
             
             # Get recent conversation history for context
@@ -119,16 +421,10 @@ class HumanizedResponseHandler:
                 conversation_history = [exchange.user_text for exchange in recent_history[-3:]]
             
             # Process asynchronously
-            result = process_user_input_async(user_text, conversation_history, phone_number)
-            
-            # Return a simple object with the results
-            class ProcessingResult:
-                def __init__(self, emotion, language, intent):
-                    self.emotion = emotion or 'neutral'
-                    self.language = language or 'en'
-                    self.intent = intent or 'general'
+            result = _async_process_user_input(user_text, conversation_history, phone_number)
             
-            return ProcessingResult(result.emotion, result.language, result.intent)
+            return ProcessingResult(result.emotion or 'neutral', result.language or 'en',
+                                    result.intent or 'general')
             
         except ImportError:
             # Fallback to synchronous processing
@@ -139,162 +435,114 @@ class HumanizedResponseHandler:
     
     def _process_user_input_sync(self, user_text: str, phone_number: str = None):
         """Synchronous fallback processing."""
-        class ProcessingResult:
-            def __init__(self, emotion, language, intent):
-                self.emotion = emotion
-                self.language = language
-                self.intent = intent
+        # Lowercase once for all keyword detectors
+        text_lower = user_text.lower()
         
         # Detect language with bias
-        language = self._detect_language_with_bias(user_text, phone_number)
+        language = self._detect_language_with_bias(user_text, text_lower, phone_number)
         
         # Detect emotion
-        emotion = self._detect_emotion(user_text)
+        emotion = self._detect_emotion(user_text, text_lower)
         
         # Detect intent
-        intent = self._detect_intent(user_text)
+        intent = self._detect_intent(text_lower)
         
         return ProcessingResult(emotion, language, intent)
     
-    def _detect_intent(self, user_text: str) -> str:
-        """Detect user intent based on keywords."""
-        text_lower = user_text.lower()
-        
-        # Basic intent detection
-        intents = {
-            'greeting': ['hello', 'hi', 'namaste', 'good morning', 'good afternoon'],
-            'booking': ['book', 'reserve', 'booking', 'reservation', 'book karo'],
-            'inquiry': ['what', 'how', 'when', 'where', 'kya', 'kaise', 'kab'],
-            'confirmation': ['yes', 'no', 'okay', 'sure', 'haan', 'nahi', 'theek'],
-            'complaint': ['problem', 'issue', 'complaint', 'wrong', 'bad', 'problem hai'],
-            'support': ['help', 'support', 'assistance', 'madad', 'help chahiye'],
-            'goodbye': ['bye', 'goodbye', 'see you', 'thank you', 'alvida']
-        }
-        
-        for intent, keywords in intents.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return intent
-        
-        return 'general'
+    def _detect_intent(self, text_lower: str) -> str:
+        """Detect user intent based on keywords in the lowercased text."""
+        return _intent_matcher().first_match(text_lower) or 'general'
     
-    def _detect_language_with_bias(self, user_text: str, phone_number: str = None) -> str:
+    def _detect_language_with_bias(self, user_text: str, text_lower: str,
+                                   phone_number: str = None) -> str:
         """Detect language with Hindi bias and phone number detection."""
         # Check phone number country code
         if phone_number and phone_number.startswith('+91'):
             return 'hi'  # Default to Hindi for Indian numbers
         
-        # Use existing language detection
-        detected_lang = detect_language(user_text)
+        # Use existing language detection (memoized by detect_language itself)
+        text_key = text_lower.strip()
+        detected_lang = detect_language(text_key)
         
         # Apply Hindi bias threshold
         if detected_lang == 'en' and self.config['hindi_bias_threshold'] > 0.5:
-            # Check for Hindi indicators with bias
-            hindi_indicators = ['मैं', 'आप', 'है', 'हैं', 'कर', 'करना', 'चाहिए', 'हो', 'होगा']
-            if any(word in user_text for word in hindi_indicators):
-                return 'hi'
-            # For mixed detection, bias toward Hindi
-            elif detected_lang == 'mixed':
+            # Check for Hindi (Devanagari) script with bias
+            if _DEVANAGARI_RE.search(text_key):
                 return 'hi'
         
         return detected_lang
     
-    def _detect_emotion(self, user_text: str) -> str:
-        """Detect user emotion using hybrid approach."""
+    def _detect_emotion(self, user_text: str, text_lower: str) -> str:
+        """Detect user emotion from keywords (GPT recalibration is applied per call turn)."""
         # Quick keyword-based detection
-        emotion = self._quick_emotion_detect(user_text)
-        
-        # GPT sentiment check every 3-4 turns for recalibration
-        if self.turn_count % 4 == 0:
-            gpt_emotion = self._gpt_sentiment_check(user_text)
-            if gpt_emotion != 'neutral':
-                emotion = gpt_emotion
-        
-        return emotion
+        return self._quick_emotion_detect(text_lower)
     
-    def _quick_emotion_detect(self, user_text: str) -> str:
-        """Quick emotion detection using keywords."""
-        text_lower = user_text.lower()
+    def _recalibrate_emotion(self, result: ProcessingResult, user_text: str,
+                             call_sid: str, turn: int) -> ProcessingResult:
+        """Hybrid emotion: apply and schedule the call's GPT sentiment checks on every full turn."""
+        # Apply the GPT recalibration this call scheduled on its previous turn, if finished
+        gpt_emotion = self._collect_sentiment_check(call_sid, turn)
+        if gpt_emotion and gpt_emotion != 'neutral':
+            result = result._replace(emotion=gpt_emotion)
+        
+        # GPT sentiment check every 3-4 turns for recalibration, run off the response path
+        if turn and not turn & 3:  # every 4th turn of this call
+            future = _SENTIMENT_EXECUTOR.submit(self._gpt_sentiment_check, user_text)
+            with self._calls_lock:
+                self._sentiment_checks[call_sid] = (turn, future)
         
-        # Angry indicators
-        angry_words = ['angry', 'frustrated', 'upset', 'annoyed', 'gussa', 'pareshan', 'problem']
-        if any(word in text_lower for word in angry_words):
-            return 'angry'
-        
-        # Confused indicators
-        confused_words = ['confused', 'don\'t understand', 'samajh nahi', 'kaise', 'kya', 'kahan']
-        if any(word in text_lower for word in confused_words):
-            return 'confused'
-        
-        # Happy indicators
-        happy_words = ['great', 'good', 'perfect', 'accha', 'shabash', 'wonderful', 'excellent']
-        if any(word in text_lower for word in happy_words):
-            return 'happy'
+        return result
+    
+    def _collect_sentiment_check(self, call_sid: str, turn: int) -> Optional[str]:
+        """Return the call's background sentiment check if it finished in time for this turn."""
+        with self._calls_lock:
+            pending = self._sentiment_checks.pop(call_sid, None)
+        if pending is None:
+            return None
         
-        return 'neutral'
+        checked_turn, future = pending
+        # Only the turn right after the analysed utterance may use the result
+        if checked_turn != turn - 1 or not future.done():
+            future.cancel()
+            return None
+        return future.result()
+    
+    def _quick_emotion_detect(self, text_lower: str) -> str:
+        """Quick emotion detection using keywords in the lowercased text."""
+        return _emotion_matcher().first_match(text_lower) or 'neutral'
     
     def _gpt_sentiment_check(self, user_text: str) -> str:
         """GPT-based sentiment analysis for complex cases."""
         try:
             # Simple sentiment prompt
             sentiment_prompt = f"Analyze the emotion in this text: '{user_text}'. Respond with only one word: angry, confused, happy, or neutral."
-            sentiment = self.ai_brain.ask(sentiment_prompt, 'en')
+            
+            # A separate brain keeps the check concurrent with response generation and out of
+            # the conversation history; _SENTIMENT_EXECUTOR runs checks one at a time, so each
+            # starts from a fresh history
+            brain = self.sentiment_brain
+            brain.provider.history = []
+            sentiment = brain.ask(sentiment_prompt, 'en')
             return sentiment.strip().lower()
-        except:
+        except Exception:
             return 'neutral'
     
     def _get_personality_prompt(self, context: str, emotion: str, language: str) -> str:
         """Get context-aware personality prompt."""
         try:
-            # Load context-specific prompt
-            base_prompt = get_context_prompt(context)
-            
-            # Add emotion-specific instructions
-            emotion_instructions = self._get_emotion_instructions(emotion, language)
-            
-            return f"{base_prompt}\n\n{emotion_instructions}"
+            return _personality_prompt(context, emotion, language)
         except Exception as e:
             print(f"Warning: Failed to load context prompt, using fallback: {e}")
             return self._get_fallback_prompt(language)
     
     def _get_emotion_instructions(self, emotion: str, language: str) -> str:
         """Get emotion-specific response instructions."""
-        if language in ['hi', 'mixed']:
-            instructions = {
-                'angry': 'User is frustrated. Respond with extra patience and empathy. Use calming language like "Chinta mat kariye" and "Main samajh sakti hun".',
-                'confused': 'User is confused. Slow down your response, use simple language, and ask clarifying questions. Use "Step by step kar lete hain".',
-                'happy': 'User is happy. Match their energy slightly while staying professional. Use positive language like "Bahut accha" and "Shabash".',
-                'neutral': 'Respond normally with warm, helpful tone.'
-            }
-        else:
-            instructions = {
-                'angry': 'User is frustrated. Respond with extra patience and empathy. Use calming language.',
-                'confused': 'User is confused. Slow down your response and use simple language.',
-                'happy': 'User is happy. Match their energy slightly while staying professional.',
-                'neutral': 'Respond normally with warm, helpful tone.'
-            }
-        
-        return instructions.get(emotion, instructions['neutral'])
+        return _emotion_instructions(emotion, language)
     
     def _generate_ai_response(self, user_text: str, system_prompt: str, language: str) -> str:
         """Generate AI response with custom system prompt."""
         try:
-            # Temporarily override system prompt
-            original_prompt = self.ai_brain.provider.history[0]['content'] if self.ai_brain.provider.history else None
-            
-            # Set new system prompt
-            if self.ai_brain.provider.history:
-                self.ai_brain.provider.history[0]['content'] = system_prompt
-            else:
-                self.ai_brain.provider.history = [{"role": "system", "content": system_prompt}]
-            
-            # Generate response
-            response = self.ai_brain.ask(user_text, language)
-            
-            # Restore original prompt
-            if original_prompt and self.ai_brain.provider.history:
-                self.ai_brain.provider.history[0]['content'] = original_prompt
-            
-            return response
+            return self.ai_brain.ask(user_text, language, system_prompt=system_prompt)
         except Exception as e:
             print(f"Error generating AI response: {e}")
             return self._get_fallback_response(language)
@@ -315,54 +563,16 @@ class HumanizedResponseHandler:
     
     def _convert_to_micro_sentences(self, text: str) -> str:
         """Convert long sentences to shorter, more natural micro-sentences."""
-        # Split on common sentence boundaries
-        sentences = text.split('. ')
-        
-        micro_sentences = []
-        for sentence in sentences:
-            if len(sentence.split()) > 12:  # Long sentence
-                # Split into smaller parts
-                parts = sentence.split(', ')
-                if len(parts) > 1:
-                    micro_sentences.extend(parts)
-                else:
-                    # Split on conjunctions
-                    conjunctions = [' aur ', ' and ', ' lekin ', ' but ', ' ya ', ' or ']
-                    for conj in conjunctions:
-                        if conj in sentence:
-                            micro_sentences.extend(sentence.split(conj))
-                            break
-                    else:
-                        micro_sentences.append(sentence)
-            else:
-                micro_sentences.append(sentence)
-        
-        return '. '.join(micro_sentences)
+        return '. '.join(_iter_micro_sentences(text))
     
     def _add_contextual_fillers(self, text: str, language: str, emotion: str) -> str:
         """Add contextual fillers based on emotion and language."""
-        import random
-        
-        if random.random() > self.config['filler_frequency']:
+        if _RNG.random() > self.config['filler_frequency']:
             return text
         
-        if language in ['hi', 'mixed']:
-            fillers = {
-                'angry': ['Hmm, samjha main', 'Theek hai '],
-                'confused': ['Achha', 'Dekho'],
-                'happy': ['Bilkul', 'Zarur'],
-                'neutral': ['Haan', 'Theek hai']
-            }
-        else:
-            fillers = {
-                'angry': ['I understand', 'Let me help'],
-                'confused': ['I see', 'Let me explain'],
-                'happy': ['Great', 'Perfect'],
-                'neutral': ['Sure', 'Okay']
-            }
-        
+        fillers = FILLERS_HI if language in _HI_LANGS else FILLERS_EN
         filler_options = fillers.get(emotion, fillers['neutral'])
-        filler = random.choice(filler_options)
+        filler = _RNG.choice(filler_options)
         
         # Add filler at natural break points
         if '. ' in text:
@@ -376,69 +586,25 @@ class HumanizedResponseHandler:
         if not self.config['enable_spoken_tone_converter']:
             return text
         
-        if language in ['hi', 'mixed']:
-            # Convert formal written patterns to spoken Hindi
-            conversions = {
-                'Please provide your name': 'Aapka naam bata dijiyega?',
-                'Please wait': 'Thoda rukiyega',
-                'I will help you': 'Main help karti hoon',
-                'Thank you': 'Dhanyawad',
-                'You are welcome': 'Koi baat nahi',
-                'I understand': 'Main samajh sakti hun',
-                'Let me check': 'Main check kar leti hoon',
-                'One moment': 'Ek second',
-                'Of course': 'Bilkul',
-                'Absolutely': 'Zarur'
-            }
-        else:
-            # Convert formal written patterns to spoken English
-            conversions = {
-                'Please provide your name': 'Could you tell me your name?',
-                'Please wait': 'Just a moment',
-                'I will help you': 'I\'ll help you with that',
-                'Thank you': 'Thanks',
-                'You are welcome': 'No problem',
-                'I understand': 'I get it',
-                'Let me check': 'Let me look that up',
-                'One moment': 'One sec',
-                'Of course': 'Sure thing',
-                'Absolutely': 'Definitely'
-            }
-        
-        result = text
-        for formal, spoken in conversions.items():
-            result = result.replace(formal, spoken)
-        
-        return result
+        # Convert formal written patterns to spoken Hindi or English
+        pattern, conversions = _spoken_conversions(language in _HI_LANGS)
+        return pattern.sub(lambda match: conversions[match.group(0)], text)
     
     def _get_fallback_prompt(self, language: str) -> str:
         """Get fallback prompt if context loading fails."""
-        if language in ['hi', 'mixed']:
+        if language in _HI_LANGS:
             return """You are Sara, a friendly AI assistant. Respond in Romanized Hinglish with a warm, helpful tone. Keep responses short and natural."""
         else:
             return """You are Sara, a friendly AI assistant. Respond in English with a warm, helpful tone. Keep responses short and natural."""
     
     def _get_fallback_response(self, language: str) -> str:
         """Get fallback response if AI generation fails."""
-        if language in ['hi', 'mixed']:
+        if language in _HI_LANGS:
             return "Sorry, main abhi help nahi kar sakti. Thoda baad mein try kariye."
         else:
             return "Sorry, I can't help right now. Please try again later."
     
     def get_greeting(self, language: str = None) -> str:
         """Get greeting using humanized approach."""
-        if language in ['hi', 'mixed']:
-            greetings = [
-                "Namaste! Main Sara hun. Aapka din kaise chal raha hai?",
-                "Hello! Main Sara hun. Kaise hain aap?",
-                "Namaste! Main Sara hun, aapki madad ke liye."
-            ]
-        else:
-            greetings = [
-                "Hello! I'm Sara. How are you doing today?",
-                "Hi there! I'm Sara, how can I help you?",
-                "Hello! I'm Sara, here to assist you."
-            ]
-        
-        import random
-        return random.choice(greetings)
+        greetings = GREETINGS_HI if language in _HI_LANGS else GREETINGS_EN
+        return _RNG.choice(greetings)
@@ -6,6 +6,7 @@ Preserves the current response behavior for backward compatibility
 when HUMANIZED_MODE is disabled.
 """
 
+import threading
 from typing import Optional
 from src.mixed_ai_brain import MixedAIBrain
 from src.language_detector import detect_language
@@ -15,7 +16,17 @@ class LegacyResponseHandler:
     """Handles responses using the current/legacy approach."""
     
     def __init__(self):
-        self.ai_brain = MixedAIBrain()
+        self._ai_brain = None
+        self._ai_brain_lock = threading.Lock()
+    
+    @property
+    def ai_brain(self) -> MixedAIBrain:
+        """AI brain, created once on first use (the factory's prewarm thread may race a request)."""
+        if self._ai_brain is None:
+            with self._ai_brain_lock:
+                if self._ai_brain is None:
+                    self._ai_brain = MixedAIBrain()
+        return self._ai_brain
     
     def generate_response(self, user_text: str, call_sid: str = None, 
                          context: str = "booking") -> str:
@@ -6,6 +6,7 @@ Factory pattern for selecting between legacy and humanized response handlers
 based on the HUMANIZED_MODE feature flag.
 """
 
+import threading
 from typing import Optional
 from src.config import is_humanized_mode_enabled
 from .legacy_response import LegacyResponseHandler
@@ -24,12 +25,25 @@ class ResponseFactory:
         if is_humanized_mode_enabled():
             if self._humanized_handler is None:
                 self._humanized_handler = HumanizedResponseHandler()
+                self._prewarm(self._humanized_handler)
             return self._humanized_handler
         else:
             if self._legacy_handler is None:
                 self._legacy_handler = LegacyResponseHandler()
+                self._prewarm(self._legacy_handler)
             return self._legacy_handler
     
+    @staticmethod
+    def _prewarm(handler):
+        """Build the handler's AI brain in the background so it overlaps call setup."""
+        def _load():
+            try:
+                handler.ai_brain
+            except Exception as e:
+                print(f"⚠️ AI brain prewarm failed, will retry on first use: {e}")
+        
+        threading.Thread(target=_load, daemon=True).start()
+    
     def generate_response(self, user_text: str, call_sid: str = None, 
                          context: str = "booking", phone_number: str = None,
                          product_id: str = None, product: dict = None) -> str:
@@ -59,6 +73,11 @@ class ResponseFactory:
         handler = self.get_handler()
         return handler.get_greeting(language)
     
+    def end_call(self, call_sid: str):
+        """Release the humanized handler's per-call state once a call has ended."""
+        if self._humanized_handler is not None:
+            self._humanized_handler.end_call(call_sid)
+    
     def clear_cache(self):
         """Clear handler cache to force recreation."""
         self._legacy_handler = None
@@ -82,6 +101,11 @@ def generate_response(user_text: str, call_sid: str = None,
     factory = get_response_factory()
     return factory.generate_response(user_text, call_sid, context, phone_number, product_id, product)
 
+def end_call(call_sid: str):
+    """Convenience function to release per-call response state when a call ends."""
+    factory = get_response_factory()
+    factory.end_call(call_sid)
+
 def get_greeting(language: str = None) -> str:
     """Convenience function to get greeting using appropriate handler."""
     factory = get_response_factory()
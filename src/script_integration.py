@@ -7,16 +7,26 @@ This module bridges the gap between the dashboard script management and bot resp
 """
 
 import os
+import re
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List, Tuple
 from enum import Enum
 
+from src.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
-class ConversationStage(Enum):
-    """Conversation stages for script selection"""
+# Usage stats are fire-and-forget; keep the dashboard round trip off the reply path
+_usage_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='script-usage')
+
+class ConversationStage(str, Enum):
+    """Conversation stages for script selection (members compare equal to their values)"""
     GREETING = "greeting"
     QUALIFICATION = "qualification"
     PRESENTATION = "presentation"
@@ -24,28 +34,59 @@ class ConversationStage(Enum):
     CLOSING = "closing"
     UPSELL = "upsell"
 
+_PLACEHOLDER_RE = re.compile(r"\{(product_name|product_price|product_description|user_name)\}")
+
+# Stage detection keywords, checked in priority order
+_STAGE_KEYWORDS = {
+    ConversationStage.GREETING: ('hello', 'hi', 'namaste', 'kaise', 'start', 'begin', 'began'),
+    ConversationStage.QUALIFICATION: ('who', 'what', 'where', 'when', 'why', 'how', 'tell me', 'about'),
+    ConversationStage.PRESENTATION: ('show', 'explain', 'detail', 'feature', 'benefit', 'advantage'),
+    ConversationStage.OBJECTION: ('expensive', 'costly', 'price', 'pricing', 'money', 'not sure', 'doubt', 'problem'),
+    ConversationStage.CLOSING: ('buy', 'bought', 'purchase', 'order', 'book', 'confirm', 'yes', 'agree'),
+    ConversationStage.UPSELL: ('more', 'additional', 'extra', 'upgrade', 'premium', 'better'),
+}
+
+# Short stage keywords that must match a whole token (see src.keyword_matcher)
+_STAGE_WHOLE_WORDS = frozenset({'hi', 'who', 'what', 'where', 'when', 'why', 'how', 'yes', 'more'})
+
+_STAGE_MATCHER = KeywordMatcher(_STAGE_KEYWORDS, whole_words=_STAGE_WHOLE_WORDS)
+
 class ScriptIntegration:
     """Handles integration of sales scripts with bot responses"""
     
     def __init__(self):
         self.dashboard_url = os.getenv('SALES_API_URL', 'http://localhost:5000')
         self.api_timeout = 5
-        self.script_cache = {}
+        self._scripts_url = f"{self.dashboard_url}/api/sales/scripts"
+        
+        # Pooled keep-alive session shared by script fetches and usage updates
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
+        # LRU of cache_key -> (scripts, expires_at); failures are cached briefly too
+        self.script_cache = OrderedDict()
+        self.stage_index = {}  # cache_key -> {scriptType: scripts, best first}
         self.cache_ttl = 300  # 5 minutes
+        self.failure_ttl = 15  # don't hammer the dashboard while it is down
+        self.cache_max_entries = 1024
+        self._cache_lock = threading.Lock()
         
     def get_active_scripts(self, product_id: str, language: str = 'en') -> List[Dict]:
         """Get all active scripts for a product"""
         cache_key = f"scripts_{product_id}_{language}"
         
         # Check cache first
-        if cache_key in self.script_cache:
-            cached_data, timestamp = self.script_cache[cache_key]
-            if time.time() - timestamp < self.cache_ttl:
-                return cached_data
+        with self._cache_lock:
+            cached = self.script_cache.get(cache_key)
+            if cached is not None and time.time() < cached[1]:
+                self.script_cache.move_to_end(cache_key)
+                return cached[0]
         
         try:
-            response = requests.get(
-                f"{self.dashboard_url}/api/sales/scripts",
+            response = self._session.get(
+                self._scripts_url,
                 params={'productId': product_id, 'language': language, 'isActive': 'true'},
                 timeout=self.api_timeout
             )
@@ -54,16 +95,38 @@ class ScriptIntegration:
                 data = response.json()
                 if data.get('success'):
                     scripts = data.get('data', [])
-                    # Cache the results
-                    self.script_cache[cache_key] = (scripts, time.time())
+                    # Cache the results and index them by stage
+                    self._cache_scripts(cache_key, scripts, self.cache_ttl)
                     return scripts
             
             logger.warning(f"Failed to get scripts: {response.status_code}")
-            return []
             
         except Exception as e:
             logger.error(f"Error getting scripts: {e}")
-            return []
+        
+        self._cache_scripts(cache_key, [], self.failure_ttl)
+        return []
+    
+    def _cache_scripts(self, cache_key: str, scripts: List[Dict], ttl: float):
+        """Store scripts and their stage index, evicting least recently used keys"""
+        stage_index = self._index_by_stage(scripts)
+        with self._cache_lock:
+            self.script_cache[cache_key] = (scripts, time.time() + ttl)
+            self.script_cache.move_to_end(cache_key)
+            self.stage_index[cache_key] = stage_index
+            while len(self.script_cache) > self.cache_max_entries:
+                evicted_key, _ = self.script_cache.popitem(last=False)
+                self.stage_index.pop(evicted_key, None)
+    
+    @staticmethod
+    def _index_by_stage(scripts: List[Dict]) -> Dict[str, List[Dict]]:
+        """Group scripts by stage, sorted by priority and success rate"""
+        index = {}
+        for script in scripts:
+            index.setdefault(script.get('scriptType'), []).append(script)
+        for stage_scripts in index.values():
+            stage_scripts.sort(key=lambda x: (x.get('priority', 1), x.get('successRate', 0)), reverse=True)
+        return index
     
     def get_script_for_stage(self, product_id: str, stage: ConversationStage, 
                            language: str = 'en', user_input: str = "") -> Optional[Dict]:
@@ -73,20 +136,19 @@ class ScriptIntegration:
         if not scripts:
             return None
         
-        # Filter scripts by stage
-        stage_scripts = [s for s in scripts if s.get('scriptType') == stage.value]
+        # Scripts for this stage, already sorted when the cache was filled
+        stage_index = self.stage_index.get(f"scripts_{product_id}_{language}", {})
+        stage_scripts = stage_index.get(stage)
         
         if not stage_scripts:
             return None
         
-        # Sort by priority and success rate
-        stage_scripts.sort(key=lambda x: (x.get('priority', 1), x.get('successRate', 0)), reverse=True)
-        
         # Check for trigger keywords if user input provided
         if user_input:
+            user_lower = user_input.lower()
             for script in stage_scripts:
                 triggers = script.get('conditions', {}).get('triggers', [])
-                if triggers and any(trigger.lower() in user_input.lower() for trigger in triggers):
+                if triggers and any(trigger.lower() in user_lower for trigger in triggers):
                     return script
         
         # Return highest priority script
@@ -94,25 +156,8 @@ class ScriptIntegration:
     
     def detect_conversation_stage(self, user_input: str, conversation_history: List[Dict] = None) -> ConversationStage:
         """Detect current conversation stage based on user input and history"""
-        user_lower = user_input.lower()
-        
-        # Stage detection keywords
-        stage_keywords = {
-            ConversationStage.GREETING: ['hello', 'hi', 'namaste', 'kaise', 'start', 'begin'],
-            ConversationStage.QUALIFICATION: ['who', 'what', 'where', 'when', 'why', 'how', 'tell me', 'about'],
-            ConversationStage.PRESENTATION: ['show', 'explain', 'details', 'features', 'benefits', 'advantages'],
-            ConversationStage.OBJECTION: ['expensive', 'costly', 'price', 'money', 'not sure', 'doubt', 'problem'],
-            ConversationStage.CLOSING: ['buy', 'purchase', 'order', 'book', 'confirm', 'yes', 'agree'],
-            ConversationStage.UPSELL: ['more', 'additional', 'extra', 'upgrade', 'premium', 'better']
-        }
-        
-        # Check for stage keywords
-        for stage, keywords in stage_keywords.items():
-            if any(keyword in user_lower for keyword in keywords):
-                return stage
-        
-        # Default to presentation if no clear stage detected
-        return ConversationStage.PRESENTATION
+        # First stage (in priority order) with a matching keyword; default to presentation
+        return _STAGE_MATCHER.first_match(user_input.lower()) or ConversationStage.PRESENTATION
     
     def format_script_content(self, script: Dict, product: Dict = None, user_name: str = None) -> str:
         """Format script content with product and user context"""
@@ -121,17 +166,27 @@ class ScriptIntegration:
         if not content:
             return ""
         
+        # Most scripts have no placeholders at all
+        if '{' not in content:
+            return content
+        
+        values = {}
+        
         # Replace variables if product info available
         if product:
-            content = content.replace('{product_name}', product.get('name', ''))
-            content = content.replace('{product_price}', product.get('price', 'Contact for pricing'))
-            content = content.replace('{product_description}', product.get('description', ''))
+            values['product_name'] = product.get('name', '')
+            values['product_price'] = product.get('price', 'Contact for pricing')
+            values['product_description'] = product.get('description', '')
         
         # Replace user name if available
         if user_name:
-            content = content.replace('{user_name}', user_name)
+            values['user_name'] = user_name
+        
+        if not values:
+            return content
         
-        return content
+        # Single pass; placeholders without a value are left as-is
+        return _PLACEHOLDER_RE.sub(lambda m: str(values.get(m.group(1), m.group(0))), content)
     
     def should_use_script(self, script: Dict, user_input: str, conversation_history: List[Dict] = None) -> bool:
         """Determine if a script should be used based on conditions"""
@@ -176,7 +231,7 @@ class ScriptIntegration:
             response = self.format_script_content(script, product)
             
             # Update usage count (async)
-            self._update_script_usage(script['_id'], True)
+            _usage_executor.submit(self._update_script_usage, script['_id'], True)
             
             return response
             
@@ -187,8 +242,8 @@ class ScriptIntegration:
     def _update_script_usage(self, script_id: str, success: bool):
         """Update script usage statistics"""
         try:
-            requests.post(
-                f"{self.dashboard_url}/api/sales/scripts/{script_id}/usage",
+            self._session.post(
+                f"{self._scripts_url}/{script_id}/usage",
                 json={'success': success},
                 timeout=self.api_timeout
             )
@@ -3,11 +3,23 @@ SMS Service using Twilio
 Sends SMS to users asking them to opt-in for WhatsApp messaging
 """
 import os
+import re
+import hashlib
 import logging
+import threading
+import time
+from functools import lru_cache
 from typing import Optional
 from twilio.rest import Client
+from twilio.request_validator import RequestValidator
 from twilio.base.exceptions import TwilioRestException
 
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Twilio configuration (reuse existing credentials)
@@ -21,29 +33,96 @@ WHATSAPP_BUSINESS_NUMBER = os.getenv("WHATSAPP_BUSINESS_DISPLAY_NUMBER", "+91 91
 # Feature flag
 ENABLE_WHATSAPP_OPTIN_SMS = os.getenv("ENABLE_WHATSAPP_OPTIN_SMS", "true").lower() == "true"
 
-# Track which numbers we've already sent opt-in SMS to (in-memory cache)
-# In production, this should be stored in a database
-_optin_sms_sent = set()
+# Opt-in dedupe is shared across workers through Redis when REDIS_URL is set;
+# keys hold a SHA-256 of the number, never the number itself
+REDIS_URL = os.getenv("REDIS_URL")
+OPTIN_SMS_TTL = 30 * 86400  # don't re-send an opt-in SMS for 30 days
+UNTRACKED_OPTIN_SMS_TTL = 3600  # without a status callback a failure goes unseen, so retry sooner
+PENDING_SMS_TTL = 86400  # Twilio reports the final status well within a day
+
+_redis_client = None
+if REDIS_AVAILABLE and REDIS_URL:
+    try:
+        _redis_client = redis.Redis.from_url(
+            REDIS_URL, decode_responses=True, socket_keepalive=True, socket_timeout=2
+        )
+    except Exception as e:
+        logger.warning(f"Redis not available for opt-in SMS dedupe: {e}")
+
+# Local fallback when Redis is not configured or unreachable (per process):
+# dedupe key -> monotonic expiry time
+_optin_sms_sent = {}
+
+# Twilio POSTs delivery updates here (see /sms_status in main.py). Without either
+# env var, main.py fills it in from its public URL (ngrok in dev) at startup.
+_base_url = os.getenv("BASE_URL", "").rstrip("/")
+SMS_STATUS_CALLBACK_URL = os.getenv("SMS_STATUS_CALLBACK_URL") or (
+    f"{_base_url}/sms_status" if _base_url else None
+)
+
+# Opt-in SMS awaiting a final delivery status: message SID -> dedupe key
+_pending_optin_sms = {}
+
+# SMS bodies; only the greeting and payment details vary per send
+_OPTIN_SMS_SUFFIX = f"""
+
+🤖 This is SARA from Eazy Dropshipping.
+
+📱 To receive payment links and updates on WhatsApp, please send "Hi" to:
+
+👉 {WHATSAPP_BUSINESS_NUMBER}
+
+Just send any message to that number, and we'll be able to send you:
+✅ Payment links
+✅ Order updates
+✅ Quick support
+
+Thank you! 🙏"""
+
+_PAYMENT_SMS_TEMPLATE = """{greeting}
+
+💳 Payment Link for {product_name}
+
+Amount: ₹{amount:.0f}
+
+Pay here: {payment_link}
+
+Thank you for choosing us! 🙏
+- SARA, Eazy Dropshipping"""
+
+# Everything except digits and '+'
+_PHONE_STRIP_RE = re.compile(r"[^\d+]")
+
+# Shared Twilio client; its HTTP session keeps connections to the API alive
+_twilio_client: Optional[Client] = None
+_twilio_client_lock = threading.Lock()
 
 
 def get_twilio_client() -> Optional[Client]:
-    """Get Twilio client if configured"""
+    """Get the shared Twilio client if configured"""
+    global _twilio_client
     if not TWILIO_ACCOUNT_SID or not TWILIO_AUTH_TOKEN:
         logger.warning("Twilio credentials not configured")
         return None
-    try:
-        return Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-    except Exception as e:
-        logger.error(f"Failed to create Twilio client: {e}")
-        return None
+    if _twilio_client is not None:
+        return _twilio_client
+    with _twilio_client_lock:
+        if _twilio_client is None:
+            try:
+                _twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+            except Exception as e:
+                logger.error(f"Failed to create Twilio client: {e}")
+                return None
+    return _twilio_client
 
 
+@lru_cache(maxsize=4096)
 def normalize_phone_number(phone: str) -> str:
     """Normalize phone number to E.164 format"""
     if not phone:
         return ""
     # Remove spaces, dashes, parentheses
-    phone = ''.join(c for c in phone if c.isdigit() or c == '+')
+    phone = _PHONE_STRIP_RE.sub("", phone)
     # Add + if missing
     if not phone.startswith('+'):
         # Assume Indian number if 10 digits
@@ -54,6 +133,84 @@ def normalize_phone_number(phone: str) -> str:
     return phone
 
 
+def set_sms_status_callback_base(public_url: Optional[str]) -> None:
+    """Use the app's public URL for SMS status callbacks unless one is configured"""
+    global SMS_STATUS_CALLBACK_URL
+    if public_url and not SMS_STATUS_CALLBACK_URL:
+        SMS_STATUS_CALLBACK_URL = f"{public_url.rstrip('/')}/sms_status"
+        logger.info(f"📬 SMS status callback: {SMS_STATUS_CALLBACK_URL}")
+
+
+def sms_status_callback_configured() -> bool:
+    """Whether status callbacks can be verified: a callback URL and the auth token that signs it"""
+    return bool(SMS_STATUS_CALLBACK_URL and TWILIO_AUTH_TOKEN)
+
+
+def validate_sms_status_request(signature: Optional[str], params: dict) -> bool:
+    """Check X-Twilio-Signature on a status callback against the URL we registered"""
+    if not signature or not TWILIO_AUTH_TOKEN or not SMS_STATUS_CALLBACK_URL:
+        return False
+    return RequestValidator(TWILIO_AUTH_TOKEN).validate(SMS_STATUS_CALLBACK_URL, params, signature)
+
+
+def _optin_key(phone: str) -> str:
+    """Dedupe key for a normalized phone number"""
+    return "optin:" + hashlib.sha256(phone.encode()).hexdigest()
+
+
+def _is_optin_sent(key: str) -> bool:
+    """Check the shared dedupe store, falling back to the local set"""
+    if _redis_client is not None:
+        try:
+            return bool(_redis_client.exists(key))
+        except Exception as e:
+            logger.warning(f"Redis opt-in lookup failed, using local cache: {e}")
+    expires_at = _optin_sms_sent.get(key)
+    return expires_at is not None and expires_at > time.monotonic()
+
+
+def _mark_optin_sent(key: str, message_sid: Optional[str] = None, ttl: int = OPTIN_SMS_TTL) -> None:
+    """Record an opt-in SMS for ttl seconds, and its SID if a delivery callback will follow"""
+    if _redis_client is not None:
+        try:
+            pipe = _redis_client.pipeline()
+            pipe.set(key, "1", ex=ttl)
+            if message_sid:
+                pipe.set(f"optin:sid:{message_sid}", key, ex=PENDING_SMS_TTL)
+            pipe.execute()
+            return
+        except Exception as e:
+            logger.warning(f"Redis opt-in update failed, using local cache: {e}")
+    _optin_sms_sent[key] = time.monotonic() + ttl
+    if message_sid:
+        _pending_optin_sms[message_sid] = key
+
+
+def _unmark_optin_sent(key: str) -> None:
+    """Forget an opt-in SMS so a later call can retry"""
+    if _redis_client is not None:
+        try:
+            _redis_client.delete(key)
+        except Exception as e:
+            logger.warning(f"Redis opt-in delete failed: {e}")
+    _optin_sms_sent.pop(key, None)
+
+
+def _get_pending_optin(message_sid: str, pop: bool) -> Optional[str]:
+    """Dedupe key for a message awaiting its delivery status"""
+    key = _pending_optin_sms.pop(message_sid, None) if pop else _pending_optin_sms.get(message_sid)
+    if key is None and _redis_client is not None:
+        try:
+            pipe = _redis_client.pipeline()
+            pipe.get(f"optin:sid:{message_sid}")
+            if pop:
+                pipe.delete(f"optin:sid:{message_sid}")
+            key = pipe.execute()[0]
+        except Exception as e:
+            logger.warning(f"Redis pending SMS lookup failed: {e}")
+    return key
+
+
 def send_whatsapp_optin_sms(
     to_phone: str,
     customer_name: Optional[str] = None,
@@ -68,7 +225,11 @@ def send_whatsapp_optin_sms(
         force: If True, send even if already sent before
         
     Returns:
-        True if SMS sent successfully, False otherwise
+        True if Twilio accepted (queued) the SMS or one was already sent recently,
+        False otherwise. Delivery is not awaited: a failed delivery reported to the
+        status callback clears the number so a later call retries. Without a
+        status callback URL the number is only suppressed for
+        UNTRACKED_OPTIN_SMS_TTL seconds.
     """
     if not ENABLE_WHATSAPP_OPTIN_SMS:
         logger.info("WhatsApp opt-in SMS is disabled")
@@ -81,7 +242,8 @@ def send_whatsapp_optin_sms(
         return False
     
     # Check if we've already sent to this number (avoid spam)
-    if to_phone in _optin_sms_sent and not force:
+    optin_key = _optin_key(to_phone)
+    if not force and _is_optin_sent(optin_key):
         logger.info(f"WhatsApp opt-in SMS already sent to {to_phone[-4:]}")
         return True  # Already sent, consider it success
     
@@ -93,66 +255,29 @@ def send_whatsapp_optin_sms(
     
     # Personalize greeting
     greeting = f"Hi {customer_name}!" if customer_name else "Hi!"
-    
-    # Compose SMS message
-    sms_body = f"""{greeting}
-
-🤖 This is SARA from Eazy Dropshipping.
-
-📱 To receive payment links and updates on WhatsApp, please send "Hi" to:
-
-👉 {WHATSAPP_BUSINESS_NUMBER}
-
-Just send any message to that number, and we'll be able to send you:
-✅ Payment links
-✅ Order updates
-✅ Quick support
-
-Thank you! 🙏"""
+    sms_body = greeting + _OPTIN_SMS_SUFFIX
 
     try:
+        create_kwargs = {}
+        if SMS_STATUS_CALLBACK_URL:
+            create_kwargs['status_callback'] = SMS_STATUS_CALLBACK_URL
         message = client.messages.create(
             body=sms_body,
             from_=TWILIO_PHONE_NUMBER,
-            to=to_phone
+            to=to_phone,
+            **create_kwargs
         )
         
         logger.info(f"📱 SMS queued to ****{to_phone[-4:]}, SID: {message.sid}")
         
-        # Check delivery status after a short delay
-        import time
-        time.sleep(2)  # Wait for delivery status update
-        
-        # Fetch updated message status
-        try:
-            updated_msg = client.messages(message.sid).fetch()
-            status = updated_msg.status
-            
-            if status in ['delivered', 'sent']:
-                logger.info(f"✅ SMS delivered to ****{to_phone[-4:]}")
-                _optin_sms_sent.add(to_phone)
-                return True
-            elif status == 'failed':
-                error_code = updated_msg.error_code
-                logger.warning(f"❌ SMS failed: Error {error_code}")
-                # Error 30044 = carrier blocked (common for India)
-                if error_code == 30044:
-                    logger.warning("⚠️ SMS blocked by carrier (Error 30044)")
-                return False
-            elif status == 'undelivered':
-                logger.warning(f"❌ SMS undelivered: {updated_msg.error_message}")
-                return False
-            else:
-                # Status is 'queued' or 'sending' - assume it might work
-                logger.info(f"📱 SMS status: {status} - assuming delivery")
-                _optin_sms_sent.add(to_phone)
-                return True
-                
-        except Exception as fetch_error:
-            logger.warning(f"Could not verify SMS delivery: {fetch_error}")
-            # Assume sent if we got this far
-            _optin_sms_sent.add(to_phone)
-            return True
+        # Don't block the caller waiting for delivery; Twilio posts failures
+        # to the status callback, which clears the number again
+        if SMS_STATUS_CALLBACK_URL:
+            _mark_optin_sent(optin_key, message.sid)
+        else:
+            logger.warning("No SMS status callback URL; opt-in SMS delivery is not tracked")
+            _mark_optin_sent(optin_key, ttl=UNTRACKED_OPTIN_SMS_TTL)
+        return True
         
     except TwilioRestException as e:
         logger.error(f"Twilio SMS error: {e.code} - {e.msg}")
@@ -162,6 +287,29 @@ Thank you! 🙏"""
         return False
 
 
+def handle_sms_status_callback(
+    message_sid: str,
+    status: str,
+    error_code: Optional[str] = None
+) -> None:
+    """Apply a Twilio SMS status callback to the opt-in tracking"""
+    if not message_sid:
+        return
+    optin_key = _get_pending_optin(message_sid, pop=status in ('delivered', 'failed', 'undelivered'))
+    if not optin_key:
+        return
+    
+    if status == 'delivered':
+        logger.info(f"✅ Opt-in SMS {message_sid} delivered")
+    elif status in ('failed', 'undelivered'):
+        logger.warning(f"❌ SMS {status}: Error {error_code}")
+        # Error 30044 = carrier blocked (common for India)
+        if str(error_code) == '30044':
+            logger.warning("⚠️ SMS blocked by carrier (Error 30044)")
+        # Allow a later retry to this number
+        _unmark_optin_sent(optin_key)
+
+
 def send_payment_link_sms(
     to_phone: str,
     payment_link: str,
@@ -193,17 +341,12 @@ def send_payment_link_sms(
         return False
     
     greeting = f"Hi {customer_name}!" if customer_name else "Hi!"
-    
-    sms_body = f"""{greeting}
-
-💳 Payment Link for {product_name}
-
-Amount: ₹{amount:.0f}
-
-Pay here: {payment_link}
-
-Thank you for choosing us! 🙏
-- SARA, Eazy Dropshipping"""
+    sms_body = _PAYMENT_SMS_TEMPLATE.format(
+        greeting=greeting,
+        product_name=product_name,
+        amount=amount,
+        payment_link=payment_link
+    )
 
     try:
         message = client.messages.create(
@@ -226,12 +369,13 @@ Thank you for choosing us! 🙏
 def has_optin_sms_been_sent(phone: str) -> bool:
     """Check if opt-in SMS was already sent to this number"""
     phone = normalize_phone_number(phone)
-    return phone in _optin_sms_sent
+    return bool(phone) and _is_optin_sent(_optin_key(phone))
 
 
 def clear_optin_cache():
-    """Clear the opt-in SMS cache (for testing)"""
+    """Clear this process's opt-in SMS cache (for testing); shared Redis keys are left alone"""
     _optin_sms_sent.clear()
+    _pending_optin_sms.clear()
     logger.info("Opt-in SMS cache cleared")
 
 
@@ -240,6 +384,10 @@ __all__ = [
     'send_whatsapp_optin_sms',
     'send_payment_link_sms',
     'has_optin_sms_been_sent',
+    'handle_sms_status_callback',
+    'set_sms_status_callback_base',
+    'validate_sms_status_request',
+    'sms_status_callback_configured',
     'clear_optin_cache',
     'ENABLE_WHATSAPP_OPTIN_SMS',
     'WHATSAPP_BUSINESS_NUMBER'
@@ -5,13 +5,22 @@ WhatsApp Service Data Models
 Pydantic models for request/response validation and MongoDB schemas.
 """
 
-from datetime import datetime
+import re
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List, Literal
 from enum import Enum
 
 from pydantic import BaseModel, Field, field_validator
 
 
+_NON_DIGIT_RE = re.compile(r"\D")
+
+
+def utcnow() -> datetime:
+    """Timezone-aware current UTC time (datetime.utcnow is deprecated)"""
+    return datetime.now(timezone.utc)
+
+
 # =============================================================================
 # ENUMS
 # =============================================================================
@@ -64,7 +73,7 @@ class SendPaymentLinkRequest(BaseModel):
     @classmethod
     def validate_phone(cls, v: str) -> str:
         """Validate and normalize phone number"""
-        digits = ''.join(filter(str.isdigit, v))
+        digits = _NON_DIGIT_RE.sub("", v)
         if len(digits) < 10:
             raise ValueError("Phone number must have at least 10 digits")
         return v
@@ -126,7 +135,7 @@ class MessageResponse(BaseModel):
     status: MessageStatus = MessageStatus.PENDING
     error_code: Optional[str] = None
     error_message: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utcnow)
 
 
 class PaymentLinkResponse(BaseModel):
@@ -139,7 +148,7 @@ class PaymentLinkResponse(BaseModel):
     status: MessageStatus = MessageStatus.PENDING
     error_code: Optional[str] = None
     error_message: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utcnow)
 
 
 class StatusResponse(BaseModel):
@@ -167,7 +176,7 @@ class WhatsAppMessageDocument(BaseModel):
     payment_link_id: Optional[str] = None
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     sent_at: Optional[datetime] = None
     delivered_at: Optional[datetime] = None
     read_at: Optional[datetime] = None
@@ -202,7 +211,7 @@ class PaymentLinkDocument(BaseModel):
     call_id: Optional[str] = None
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     paid_at: Optional[datetime] = None
     expired_at: Optional[datetime] = None
     expires_at: Optional[datetime] = None
@@ -242,8 +251,8 @@ class ConversationState(BaseModel):
     
     # State
     is_active: bool = True
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
 
 # =============================================================================
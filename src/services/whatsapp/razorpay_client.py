@@ -12,10 +12,12 @@ import os
 import logging
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 import httpx
 
+from .models import utcnow
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -164,7 +166,7 @@ class RazorpayClient:
         """
         # Default expiry: 24 hours from now
         if expire_by is None:
-            expire_by = int((datetime.utcnow() + timedelta(hours=24)).timestamp())
+            expire_by = int((utcnow() + timedelta(hours=24)).timestamp())
         
         normalized_phone = self._normalize_phone(customer_phone)
         
@@ -13,7 +13,7 @@ Webhook Events:
 import hashlib
 import hmac
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
 
 from .models import (
@@ -21,6 +21,7 @@ from .models import (
     PaymentStatus,
     WebhookMessage,
     WebhookStatus,
+    utcnow,
 )
 from .config import WHATSAPP_WEBHOOK_VERIFY_TOKEN
 
@@ -211,7 +212,7 @@ class WebhookHandler:
         ts = None
         if timestamp:
             try:
-                ts = datetime.fromtimestamp(int(timestamp))
+                ts = datetime.fromtimestamp(int(timestamp), timezone.utc)
             except:
                 pass
         
@@ -230,7 +231,7 @@ class WebhookHandler:
         webhook_status = WebhookStatus(
             message_id=message_id,
             status=status,
-            timestamp=ts or datetime.utcnow(),
+            timestamp=ts or utcnow(),
             recipient_phone=recipient or "",
             error_code=error_code,
             error_message=error_message
@@ -270,10 +271,10 @@ class WebhookHandler:
                 text = interactive.get("list_reply", {}).get("title")
         
         # Parse timestamp
-        ts = datetime.utcnow()
+        ts = utcnow()
         if timestamp:
             try:
-                ts = datetime.fromtimestamp(int(timestamp))
+                ts = datetime.fromtimestamp(int(timestamp), timezone.utc)
             except:
                 pass
         
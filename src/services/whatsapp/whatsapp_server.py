@@ -17,7 +17,6 @@ Endpoints:
 """
 
 import logging
-from datetime import datetime
 from typing import Optional
 
 from fastapi import FastAPI, HTTPException, Request, Response, Depends
@@ -33,6 +32,7 @@ from .models import (
     MessageResponse,
     StatusResponse,
     MessageStatus,
+    utcnow,
 )
 from .whatsapp_service import WhatsAppService, get_whatsapp_service
 from .webhook_handler import WebhookHandler, get_webhook_handler
@@ -151,7 +151,7 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "whatsapp",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": utcnow().isoformat(),
         "config": config
     }
 
@@ -296,7 +296,7 @@ async def get_message_status(
     return StatusResponse(
         message_id=message_id,
         message_status=MessageStatus.PENDING,  # Would come from DB
-        last_updated=datetime.utcnow()
+        last_updated=utcnow()
     )
 
 
@@ -32,6 +32,7 @@ from .models import (
     WhatsAppMessageDocument,
     PaymentLinkDocument,
     ConversationState,
+    utcnow,
 )
 from .config import (
     ENABLE_WHATSAPP,
@@ -111,7 +112,7 @@ class WhatsAppService:
         
         if self._db is None:
             try:
-                self._db_client = AsyncIOMotorClient(self._mongodb_uri)
+                self._db_client = AsyncIOMotorClient(self._mongodb_uri, tz_aware=True)  # read back the aware UTC times we write
                 self._db = self._db_client[self._mongodb_database]
                 logger.info(f"Connected to MongoDB: {self._mongodb_database}")
             except Exception as e:
@@ -552,16 +553,16 @@ class WhatsAppService:
             return
         
         try:
-            update = {"status": status.value, "updated_at": datetime.utcnow()}
+            update = {"status": status.value, "updated_at": utcnow()}
             
             if status == MessageStatus.SENT:
-                update["sent_at"] = timestamp or datetime.utcnow()
+                update["sent_at"] = timestamp or utcnow()
             elif status == MessageStatus.DELIVERED:
-                update["delivered_at"] = timestamp or datetime.utcnow()
+                update["delivered_at"] = timestamp or utcnow()
             elif status == MessageStatus.READ:
-                update["read_at"] = timestamp or datetime.utcnow()
+                update["read_at"] = timestamp or utcnow()
             elif status == MessageStatus.FAILED:
-                update["failed_at"] = timestamp or datetime.utcnow()
+                update["failed_at"] = timestamp or utcnow()
             
             await db.whatsapp_messages.update_one(
                 {"message_id": message_id},
@@ -635,7 +636,7 @@ class WhatsAppService:
                 status=MessageStatus.SENT,
                 call_id=call_id,
                 payment_link_id=payment_link_id,
-                sent_at=datetime.utcnow(),
+                sent_at=utcnow(),
                 metadata=metadata or {}
             )
             
@@ -0,0 +1,33 @@
+from src.dynamic_prompt_builder import DynamicPromptBuilder
+
+
+def test_product_sections_are_reused_for_the_same_version():
+    builder = DynamicPromptBuilder()
+    product = {'product_id': 'p1', 'updated_at': '2026-01-01T00:00:00', 'name': 'Trading Bot'}
+    
+    sections = builder._get_product_sections(product)
+    assert builder._get_product_sections(dict(product)) is sections
+
+
+def test_product_sections_are_rebuilt_for_a_new_version():
+    builder = DynamicPromptBuilder()
+    product = {'product_id': 'p1', 'updated_at': '2026-01-01T00:00:00', 'name': 'Trading Bot'}
+    
+    _, context, _, _ = builder._get_product_sections(product)
+    assert 'Trading Bot' in context
+    
+    product.update(name='Trading Bot Pro', updated_at='2026-01-02T00:00:00')
+    _, context, _, _ = builder._get_product_sections(product)
+    assert 'Trading Bot Pro' in context
+
+
+def test_unversioned_product_sections_follow_in_place_edits():
+    builder = DynamicPromptBuilder()
+    product = {'name': 'Trading Bot', 'price': '2000', 'features': ['Automatic trading']}
+    
+    _, context, _, _ = builder._get_product_sections(product)
+    assert 'Trading Bot' in context
+    
+    product['name'] = 'Trading Bot Pro'
+    _, context, _, _ = builder._get_product_sections(product)
+    assert 'Trading Bot Pro' in context
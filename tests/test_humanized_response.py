@@ -0,0 +1,68 @@
+from src.responses.humanized_response import HumanizedResponseHandler, _iter_micro_sentences
+
+
+def micro(text):
+    return list(_iter_micro_sentences(text))
+
+
+def test_short_sentences_are_kept():
+    text = "Hello there. How can I help you today"
+    assert micro(text) == ["Hello there", "How can I help you today"]
+
+
+def test_long_sentence_splits_on_commas_only():
+    text = "The story goes on and on, with commas and more words here, until it finally stops"
+    assert micro(text) == [
+        "The story goes on and on",
+        "with commas and more words here",
+        "until it finally stops",
+    ]
+
+
+def test_long_sentence_without_commas_splits_on_first_conjunction_found():
+    text = "You can pay by card or cash at the desk and we will send the receipt today"
+    assert micro(text) == [
+        "You can pay by card or cash at the desk",
+        "we will send the receipt today",
+    ]
+
+
+def test_word_count_ignores_extra_whitespace():
+    # 12 words with double spaces: not long
+    assert micro("one  two  three  four  five  six  seven  eight  nine  ten  eleven  twelve") == [
+        "one  two  three  four  five  six  seven  eight  nine  ten  eleven  twelve"
+    ]
+    # 13 words with a newline: long, so it splits
+    text = "one two three four five six\nseven eight and nine ten eleven twelve"
+    assert micro(text) == ["one two three four five six\nseven eight", "nine ten eleven twelve"]
+
+
+def test_canned_replies_do_not_count_as_turns():
+    handler = HumanizedResponseHandler()
+    
+    assert handler.generate_response("hello", call_sid="CA1")
+    assert handler.generate_response("...", call_sid="CA1")
+    assert "CA1" not in handler._call_turns
+
+
+class _FakeBrain:
+    def __init__(self):
+        self.provider = type('Provider', (), {'history': []})()
+    
+    def ask(self, user_text, language=None, system_prompt=None):
+        return 'angry' if user_text.startswith('Analyze') else 'Sure.'
+
+
+def test_repeated_utterances_still_schedule_sentiment_checks_per_call():
+    handler = HumanizedResponseHandler()
+    handler._ai_brain = _FakeBrain()
+    handler._sentiment_brain = _FakeBrain()
+    
+    handler.generate_response("tell me about the plan", call_sid="CA1")
+    for _ in range(3):
+        handler.generate_response("what does it cost", call_sid="CA1")
+    handler.generate_response("what does it cost", call_sid="CA2")
+    
+    assert handler._sentiment_checks["CA1"][0] == 4
+    assert "CA2" not in handler._sentiment_checks
+    assert set(handler._last_processing) == {"CA1", "CA2"}
@@ -0,0 +1,25 @@
+import os
+
+# Production mode skips the interactive dependency check on import
+os.environ.setdefault('FLASK_ENV', 'production')
+
+import main
+
+
+def test_transcript_lines_for_a_call_are_merged_one_per_line():
+    batch = [
+        ('CA1', '\n[10:00:01] User: hello'),
+        ('CA2', '\n[10:00:01] User: hi'),
+        ('CA1', '\n[10:00:02] Sara (en): Hi there!'),
+    ]
+    assert main._coalesce_transcripts(batch) == {
+        'CA1': '\n[10:00:01] User: hello\n[10:00:02] Sara (en): Hi there!',
+        'CA2': '\n[10:00:01] User: hi',
+    }
+
+
+def test_transcript_lines_without_leading_newline_do_not_run_together():
+    batch = [('CA1', '[10:00:01] User: hello'), ('CA1', '[10:00:02] User: anyone there?')]
+    assert main._coalesce_transcripts(batch) == {
+        'CA1': '\n[10:00:01] User: hello\n[10:00:02] User: anyone there?',
+    }
@@ -0,0 +1,45 @@
+import pytest
+
+from src.script_integration import ConversationStage, ScriptIntegration
+
+
+@pytest.fixture
+def integration():
+    return ScriptIntegration()
+
+
+@pytest.mark.parametrize("text, stage", [
+    ("I am booking it now", ConversationStage.CLOSING),
+    ("we ordered yesterday", ConversationStage.CLOSING),
+    ("the prices seem high", ConversationStage.OBJECTION),
+    ("I have doubts", ConversationStage.OBJECTION),
+    ("any problems", ConversationStage.OBJECTION),
+    ("showing the features please", ConversationStage.PRESENTATION),
+    ("upgrading to premium", ConversationStage.UPSELL),
+    ("extras", ConversationStage.UPSELL),
+    ("let's get started", ConversationStage.GREETING),
+])
+def test_inflected_keywords_match_their_stage(integration, text, stage):
+    assert integration.detect_conversation_stage(text) == stage
+
+
+@pytest.mark.parametrize("text, stage", [
+    ("I bought one", ConversationStage.CLOSING),
+    ("pricing", ConversationStage.OBJECTION),
+    ("it was explained in detail", ConversationStage.PRESENTATION),
+    ("one feature I like", ConversationStage.PRESENTATION),
+    ("it began well", ConversationStage.GREETING),
+])
+def test_forms_without_their_base_keyword_match_their_stage(integration, text, stage):
+    assert integration.detect_conversation_stage(text) == stage
+
+
+@pytest.mark.parametrize("text, stage", [
+    ("show me this", ConversationStage.PRESENTATION),  # not 'hi' in 'this' / 'how' in 'show'
+    ("my eyes hurt", ConversationStage.PRESENTATION),  # not 'yes' in 'eyes'
+    ("hi there", ConversationStage.GREETING),
+    ("how does it work", ConversationStage.QUALIFICATION),
+    ("yes", ConversationStage.CLOSING),
+])
+def test_short_keywords_match_whole_words_only(integration, text, stage):
+    assert integration.detect_conversation_stage(text) == stage
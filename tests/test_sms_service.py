@@ -0,0 +1,61 @@
+from twilio.request_validator import RequestValidator
+
+from src.services import sms_service
+
+AUTH_TOKEN = "test-auth-token"
+PARAMS = {"MessageSid": "SM123", "MessageStatus": "delivered"}
+
+
+def test_status_callback_unconfigured_is_rejected(monkeypatch):
+    monkeypatch.setattr(sms_service, "TWILIO_AUTH_TOKEN", AUTH_TOKEN)
+    monkeypatch.setattr(sms_service, "SMS_STATUS_CALLBACK_URL", None)
+    signature = RequestValidator(AUTH_TOKEN).compute_signature("https://example.com/sms_status", PARAMS)
+
+    assert not sms_service.sms_status_callback_configured()
+    assert not sms_service.validate_sms_status_request(signature, PARAMS)
+
+
+def test_valid_signature_on_derived_url_is_accepted(monkeypatch):
+    monkeypatch.setattr(sms_service, "TWILIO_AUTH_TOKEN", AUTH_TOKEN)
+    monkeypatch.setattr(sms_service, "SMS_STATUS_CALLBACK_URL", None)
+    sms_service.set_sms_status_callback_base("https://abc.ngrok.io/")
+    signature = RequestValidator(AUTH_TOKEN).compute_signature("https://abc.ngrok.io/sms_status", PARAMS)
+
+    assert sms_service.sms_status_callback_configured()
+    assert sms_service.validate_sms_status_request(signature, PARAMS)
+
+
+def test_invalid_signature_is_rejected(monkeypatch):
+    monkeypatch.setattr(sms_service, "TWILIO_AUTH_TOKEN", AUTH_TOKEN)
+    monkeypatch.setattr(sms_service, "SMS_STATUS_CALLBACK_URL", "https://abc.ngrok.io/sms_status")
+    signature = RequestValidator("other-token").compute_signature("https://abc.ngrok.io/sms_status", PARAMS)
+
+    assert not sms_service.validate_sms_status_request(signature, PARAMS)
+
+
+class _FakeMessages:
+    def create(self, **kwargs):
+        self.kwargs = kwargs
+        return type("Message", (), {"sid": "SM456"})()
+
+
+class _FakeClient:
+    messages = _FakeMessages()
+
+
+def test_optin_without_status_callback_is_only_suppressed_briefly(monkeypatch):
+    monkeypatch.setattr(sms_service, "ENABLE_WHATSAPP_OPTIN_SMS", True)
+    monkeypatch.setattr(sms_service, "SMS_STATUS_CALLBACK_URL", None)
+    monkeypatch.setattr(sms_service, "_redis_client", None)
+    monkeypatch.setattr(sms_service, "get_twilio_client", lambda: _FakeClient())
+    sms_service.clear_optin_cache()
+
+    assert sms_service.send_whatsapp_optin_sms("9876543210")
+    assert sms_service.has_optin_sms_been_sent("9876543210")
+    assert "status_callback" not in _FakeClient.messages.kwargs
+
+    # The suppression expires after the short untracked TTL
+    key = sms_service._optin_key("+919876543210")
+    sms_service._optin_sms_sent[key] -= sms_service.UNTRACKED_OPTIN_SMS_TTL
+    assert not sms_service.has_optin_sms_been_sent("9876543210")
+    sms_service.clear_optin_cache()